@@ -0,0 +1,64 @@
+"""
+Study Agent requests as plain functions, so several can run at once.
+
+Each `*_stream` function answers one Study Agents tab (fetch the source,
+summarize it or fall back to the agent's own tools) and returns a stream of
+content deltas; the tabs queue them for job_queue workers (see
+AGENT_STREAMS). Every model call goes through study_agents.model_slot, so
+concurrent runs in one process with the same API key share its Groq rate
+limit and concurrency cap. Nothing here touches Streamlit.
+"""
+from study_agents import build_agent, stream_agent
+
+
+def youtube_stream(api_key, video_url, query, timings, cache=None):
+    from long_summaries import stream_long_summary, youtube_transcript
+
+    transcript = youtube_transcript(video_url)
+    if transcript:
+        # A new summarizer per map call: agents keep per-run state and the calls run in parallel
+        return stream_long_summary(lambda: build_agent("summarizer", api_key), query,
+                                   [("the video transcript", transcript)], timings, cache=cache)
+    return stream_agent(build_agent("youtube", api_key), f"{query} {video_url}", timings, cache=cache)
+
+
+def arxiv_stream(api_key, search_query, timings, cache=None):
+    from long_summaries import arxiv_papers, stream_long_summary
+
+    instruction = f"Find and summarize the 5 latest papers on {search_query}."
+    try:
+        papers = arxiv_papers(search_query)
+    except Exception:
+        papers = []  # let the agent try with its own tools
+    if papers:
+        return stream_long_summary(lambda: build_agent("summarizer", api_key), instruction, papers,
+                                   timings, cache=cache)
+    return stream_agent(build_agent("arxiv", api_key), instruction, timings, cache=cache)
+
+
+def web_stream(api_key, search_query, timings, cache=None):
+    message = f"Search and summarize content about {search_query}."
+    return stream_agent(build_agent("web", api_key), message, timings, cache=cache)
+
+
+def flashcards_stream(api_key, topic, timings, cache=None):
+    from notes_index import default_notes_index
+
+    message = f"Generate 5 flashcards for the topic: {topic}."
+    try:
+        passages = default_notes_index().search(topic)
+    except Exception:
+        passages = []  # the knowledge base is optional; use the plain prompt
+    if passages:
+        notes = "\n\n".join(passage for _, _, passage in passages)
+        message += f" Base them on these notes:\n\n{notes}"
+    return stream_agent(build_agent("flashcards", api_key), message, timings, cache=cache)
+
+
+# Agent name -> stream function (as run by job_queue workers, with keyword inputs)
+AGENT_STREAMS = {
+    "youtube": youtube_stream,
+    "arxiv": arxiv_stream,
+    "web": web_stream,
+    "flashcards": flashcards_stream,
+}
@@ -0,0 +1,244 @@
+"""
+Generate notes for many syllabi in one headless run.
+
+Syllabi are read from JSON, YAML or CSV files (or every such file in a
+directory). All topics of all pending units are fetched together on the
+shared I/O thread pool, and unit documents are built in a process pool as
+soon as their topics are in. Progress is checkpointed to a manifest in the
+output folder, so an interrupted run resumes where it stopped and units
+whose topics have not changed are skipped.
+
+Usage:
+    python batch_notes.py syllabi/ --out Batch_Notes
+    python batch_notes.py course1.yaml course2.json units.csv --workers 8
+
+Formats:
+    JSON / YAML: {"Unit 1": "AVL Tree, Binary Search Tree", "Unit 2": [...]}
+                 or {"name": "DSA", "units": {...}}
+    CSV:         columns unit,topic (one row per topic) or unit,topics
+                 (comma separated), plus an optional syllabus column
+"""
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from gfg import cache, iter_syllabus_articles
+from html_to_docx import DocxBuilder
+from metrics import METRICS_FILE, metrics
+from notes_jobs import build_unit_fragments
+
+MANIFEST_NAME = "manifest.json"
+SYLLABUS_EXTENSIONS = (".json", ".yaml", ".yml", ".csv")
+
+
+# ----- Reading syllabi -----
+
+def _topic_list(topics):
+    if isinstance(topics, str):
+        topics = topics.split(",")
+    return [str(t).strip() for t in topics if str(t).strip()]
+
+
+def _from_mapping(data, default_name):
+    name = data.get("name", default_name) if isinstance(data.get("units"), dict) else default_name
+    units = data["units"] if isinstance(data.get("units"), dict) else data
+    return {name: {str(unit).strip(): _topic_list(topics) for unit, topics in units.items()}}
+
+
+def _read_csv(path, default_name):
+    syllabi = {}
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            row = {key.strip().lower(): (value or "").strip() for key, value in row.items() if key}
+            name = row.get("syllabus") or default_name
+            units = syllabi.setdefault(name, {})
+            topics = units.setdefault(row["unit"], [])
+            topics.extend(_topic_list(row.get("topics") or row.get("topic", "")))
+    return syllabi
+
+
+def read_syllabi(paths):
+    """
+    Load syllabi from files and directories.
+    Returns:
+        dict: Syllabus name -> {unit name -> [topics]}.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files += [os.path.join(root, n) for n in sorted(names) if n.lower().endswith(SYLLABUS_EXTENSIONS)]
+        else:
+            files.append(path)
+
+    syllabi = {}
+    for path in files:
+        default_name = os.path.splitext(os.path.basename(path))[0]
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            syllabi.update(_read_csv(path, default_name))
+            continue
+        with open(path, encoding="utf-8") as file:
+            if extension in (".yaml", ".yml"):
+                import yaml
+                data = yaml.safe_load(file)
+            else:
+                data = json.load(file)
+        syllabi.update(_from_mapping(data, default_name))
+    return syllabi
+
+
+# ----- Checkpoint manifest -----
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
+
+
+def inputs_hash(unit, topics):
+    return hashlib.sha256(json.dumps([unit, topics], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def safe_name(name):
+    return re.sub(r"[^\w.\-–]+", "_", name).strip("_") or "unnamed"
+
+
+# ----- Building -----
+
+def build_unit(output_path, fragments):
+    """Process-pool worker: build one unit document. Returns (bytes written, seconds)."""
+    start = time.perf_counter()
+    builder = DocxBuilder()
+    for fragment in fragments:
+        builder.add_html(fragment)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = f"{output_path}.partial"
+    builder.save(tmp_path)
+    os.replace(tmp_path, output_path)
+    return os.path.getsize(output_path), time.perf_counter() - start
+
+
+def run(syllabi, out_dir, workers=None, force=False):
+    """
+    Build every pending unit of every syllabus.
+    Returns:
+        dict: Throughput summary.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    start = time.perf_counter()
+
+    # Only units that are new, changed or missing their output are fetched
+    pending, skipped = {}, 0
+    for name, units in syllabi.items():
+        for unit, topics in units.items():
+            entry_key = f"{name}/{unit}"
+            entry = manifest.get(entry_key)
+            done = (entry and entry["inputs_hash"] == inputs_hash(unit, topics)
+                    and os.path.exists(os.path.join(out_dir, entry["output"])))
+            if done and not force:
+                skipped += 1
+            else:
+                pending[(name, unit)] = topics
+    topics_total = sum(len(topics) for topics in pending.values())
+    print(f"{len(pending)} units to build ({topics_total} topics), {skipped} unchanged units skipped")
+
+    counts = {"built": 0, "failed": 0, "bytes": 0}
+    fetch_stats = {}
+
+    def record(name, unit, output, future):
+        # Called in syllabus order, so the manifest always reflects a prefix of finished units
+        try:
+            size, seconds = future.result()
+        except Exception as e:
+            counts["failed"] += 1
+            print(f"FAILED {name} / {unit}: {e}")
+            return
+        counts["built"] += 1
+        counts["bytes"] += size
+        manifest[f"{name}/{unit}"] = {
+            "inputs_hash": inputs_hash(unit, pending[(name, unit)]),
+            "output": output,
+            "bytes": size,
+            "build_seconds": round(seconds, 3),
+            "completed_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        save_manifest(out_dir, manifest)
+        done = counts["built"] + counts["failed"]
+        print(f"[{done}/{len(pending)}] {name} / {unit} -> {output} ({size / 1024:.0f} KB, {seconds:.1f} s)")
+
+    # Spawned, not forked: a fork taken while fetch threads hold the HTTP cache's lock
+    # would leave that lock held forever in the worker that downloads images
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        in_flight = deque()
+        for (name, unit), results in iter_syllabus_articles(pending, stats=fetch_stats):
+            output = os.path.join(safe_name(name), f"{safe_name(unit)}.docx")
+            fragments = build_unit_fragments(unit, results)
+            future = pool.submit(build_unit, os.path.join(out_dir, output), fragments)
+            in_flight.append((name, unit, output, future))
+            # Checkpoint finished units while later ones are still being fetched
+            while in_flight and in_flight[0][3].done():
+                record(*in_flight.popleft())
+        while in_flight:
+            record(*in_flight.popleft())
+
+    built, failed, bytes_written = counts["built"], counts["failed"], counts["bytes"]
+    elapsed = time.perf_counter() - start
+    return {
+        "units_built": built,
+        "units_failed": failed,
+        "units_skipped": skipped,
+        "topics": topics_total,
+        "seconds": elapsed,
+        "units_per_minute": built * 60 / elapsed if elapsed else 0.0,
+        "topics_per_second": topics_total / elapsed if elapsed else 0.0,
+        "megabytes_written": bytes_written / 1e6,
+        "fetches_saved": fetch_stats.get("fetches_saved", 0),
+        "cache": cache.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Syllabus files or directories")
+    parser.add_argument("--out", default="Batch_Notes", help="Output folder (default: Batch_Notes)")
+    parser.add_argument("--workers", type=int, default=None, help="Document build processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild units even if their topics are unchanged")
+    args = parser.parse_args()
+
+    syllabi = read_syllabi(args.inputs)
+    if not syllabi:
+        raise SystemExit("No syllabi found.")
+    summary = run(syllabi, args.out, workers=args.workers, force=args.force)
+
+    print()
+    print(f"Built {summary['units_built']} units ({summary['units_failed']} failed, "
+          f"{summary['units_skipped']} skipped) from {summary['topics']} topics in {summary['seconds']:.1f} s")
+    print(f"Throughput: {summary['units_per_minute']:.1f} units/min, {summary['topics_per_second']:.2f} topics/s, "
+          f"{summary['megabytes_written']:.1f} MB written, {summary['fetches_saved']} duplicate fetches saved")
+    stats = summary["cache"]
+    print(f"Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['revalidated']} revalidated")
+    if METRICS_FILE:
+        metrics.export(METRICS_FILE)
+        print(f"Metrics written to {METRICS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Measure what the Study Agents tab spends on agent setup per rerun/click.
+
+Compares building the four agents from scratch (model, Groq client and tools
+included, as every click did before they were cached) with what each request
+does now: a new Agent around the model and tools cached for its API key. Also
+reports the cold cost of the first build in a fresh interpreter (imports
+included).
+No request is sent to Groq; a dummy key is enough.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_agent_setup
+"""
+import subprocess
+import sys
+import time
+
+from study_agents import AGENT_DESCRIPTIONS, _agent_parts, build_agent
+
+API_KEY = "gsk_benchmark_dummy_key"
+ROUNDS = 20
+
+COLD_SNIPPET = """
+import time
+start = time.perf_counter()
+from study_agents import AGENT_DESCRIPTIONS, build_agent
+for name in AGENT_DESCRIPTIONS:
+    build_agent(name, "gsk_benchmark_dummy_key")
+print(time.perf_counter() - start)
+"""
+
+
+def build_from_scratch(name, api_key):
+    _agent_parts.cache_clear()
+    return build_agent(name, api_key)
+
+
+def per_round(func):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for name in AGENT_DESCRIPTIONS:
+            func(name, API_KEY)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def main():
+    cold = float(subprocess.check_output([sys.executable, "-c", COLD_SNIPPET], text=True).strip().splitlines()[-1])
+    print(f"cold start (imports + 4 agents):  {cold * 1000:8.1f} ms")
+    print(f"rebuild 4 agents (before):        {per_round(build_from_scratch) * 1000:8.1f} ms per request")
+    per_round(build_agent)  # fill the cache
+    print(f"4 agents on cached parts (after): {per_round(build_agent) * 1000:8.3f} ms per request")
+
+
+if __name__ == "__main__":
+    main()
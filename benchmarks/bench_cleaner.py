@@ -0,0 +1,99 @@
+"""
+Micro-benchmark for the article text cleaner.
+
+Compares the old multi-pass regex cleanup with text_cleaner.TextCleaner on
+real GfG articles and prints throughput in MB/s.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_cleaner                       # fetch default topics (cached)
+    python -m benchmarks.bench_cleaner "AVL Tree" "Heap"     # fetch these topics
+    python -m benchmarks.bench_cleaner --files a.html b.html # use saved article HTML
+"""
+import argparse
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from gfg import fetch_gfg_article_html, search_gfg_with_google
+from notes_blocks import HTML_PARSER
+from text_cleaner import TextCleaner
+
+DEFAULT_TOPICS = ["AVL Tree", "Binary Search Tree", "Heap Data Structure", "Dijkstra's shortest path algorithm"]
+MIN_SECONDS = 1.0
+
+
+def legacy_preprocess(raw_content):
+    """The cleanup the app ran before text_cleaner: 11 uncompiled passes over the markup."""
+    cleaned_content = re.sub(r'\n+', '\n', raw_content)
+    cleaned_content = cleaned_content.strip()
+    to_remove = [
+        r'\bSummarize\b', r'\bComments\b', r'\bImprove\b', r'\bLike Article\b', r'\bSave\b',
+        r'\bShare\b', r'\bReport\b', r'\bFollow\b', r'Last Updated\s*:\s*\d{1,2} \w+, \d{4}'
+    ]
+    for phrase in to_remove:
+        cleaned_content = re.sub(phrase, '', cleaned_content, flags=re.IGNORECASE)
+    cleaned_content = re.sub(r'\bSuggest changes\b', '', cleaned_content, flags=re.IGNORECASE)
+    cleaned_content = re.sub(r'\s{2,}', ' ', cleaned_content)
+    return cleaned_content
+
+
+def load_articles(args):
+    if args.files:
+        articles = []
+        for path in args.files:
+            with open(path, encoding="utf-8") as file:
+                articles.append(file.read())
+        return articles
+    articles = []
+    for topic in args.topics or DEFAULT_TOPICS:
+        url = search_gfg_with_google(topic)
+        html = fetch_gfg_article_html(url, cleaner=None) if url else None
+        if html:
+            articles.append(html)
+        else:
+            print(f"Skipping {topic}: no article found")
+    return articles
+
+
+def throughput(label, func, inputs, size):
+    """Run func over all inputs repeatedly for at least MIN_SECONDS and print MB/s."""
+    rounds, start = 0, time.perf_counter()
+    while True:
+        for item in inputs:
+            func(item)
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            break
+    print(f"{label:<32} {size * rounds / elapsed / 1e6:8.1f} MB/s  ({rounds} rounds)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("topics", nargs="*", help="Topics to fetch from GfG")
+    parser.add_argument("--files", nargs="+", help="Saved article HTML files instead of fetching")
+    args = parser.parse_args()
+
+    articles = load_articles(args)
+    if not articles:
+        raise SystemExit("No articles to benchmark.")
+    size = sum(len(html.encode("utf-8")) for html in articles)
+    print(f"{len(articles)} articles, {size / 1e6:.2f} MB of HTML")
+
+    cleaner = TextCleaner()
+    soups = [BeautifulSoup(html, HTML_PARSER) for html in articles]
+    texts = [[str(node) for node in soup.find_all(string=True)] for soup in soups]
+
+    throughput("legacy preprocess (markup)", legacy_preprocess, articles, size)
+    throughput("TextCleaner.clean (text nodes)", lambda nodes: [cleaner.clean(t) for t in nodes], texts, size)
+    # clean_tree edits the trees in place, so it is timed over a single pass
+    start = time.perf_counter()
+    for soup in soups:
+        cleaner.clean_tree(soup)
+    elapsed = time.perf_counter() - start
+    print(f"{'TextCleaner.clean_tree (1 pass)':<32} {size / elapsed / 1e6:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
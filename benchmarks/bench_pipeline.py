@@ -0,0 +1,194 @@
+"""
+Offline benchmarks for the notes pipeline, replayed from recorded GfG fixtures.
+
+Stages:
+    search   search_gfg_with_google for every topic
+    fetch    fetch_gfg_article_html (download + parse, no text cleanup)
+    clean    TextCleaner.clean_tree over the parsed articles
+    convert  convert_html_to_docx_bytes for one document with every topic (images included)
+    unit     end to end: fetch every topic concurrently and render units of 10 topics
+    job      a NotesJob for units of 10 topics plus a combined document, as the app runs it
+             (honours --memory-budget-mb)
+
+Every stage runs for 1, 10 and 100 topics, each scenario in a fresh
+interpreter with an empty cache, and reports wall time, peak RSS and the
+size of the DOCX output. Results can be saved and compared against an
+earlier run to catch regressions.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --stages unit --sizes 10 100 --latency 0.05
+    python -m benchmarks.bench_pipeline --save baseline.json
+    python -m benchmarks.bench_pipeline --stages job --sizes 100 --memory-budget-mb 256
+    python -m benchmarks.bench_pipeline --compare baseline.json   # exits 1 on a regression
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from metrics import peak_rss_mb
+
+STAGES = ["search", "fetch", "clean", "convert", "unit", "job"]
+SIZES = [1, 10, 100]
+TOPICS_PER_UNIT = 10
+TOLERANCE = 0.2  # a metric more than 20% worse than the baseline is a regression
+METRICS = ["seconds", "peak_rss_mb", "docx_bytes"]
+
+
+# ----- One scenario (runs in a child interpreter) -----
+
+def run_scenario(stage, size, latency):
+    """Run one stage for `size` topics against the replay server. Returns the result dict."""
+    from bs4 import BeautifulSoup
+
+    import gfg
+    from benchmarks.gfg_replay import ReplayServer
+    from html_to_docx import convert_html_to_docx_bytes
+    from notes_blocks import HTML_PARSER
+    from notes_jobs import NotesJob, build_unit_fragments, render_fragments
+    from text_cleaner import default_cleaner
+
+    server = ReplayServer(latency=latency).start()
+    gfg.GFG_SEARCH_URL = server.search_url
+    topics = [f"topic {i}" for i in range(size)]
+    syllabus = {
+        f"Unit {n // TOPICS_PER_UNIT + 1}": topics[n:n + TOPICS_PER_UNIT]
+        for n in range(0, size, TOPICS_PER_UNIT)
+    }
+    docx_bytes = 0
+
+    # Inputs of later stages are prepared outside the timed section
+    if stage in ("fetch", "clean", "convert"):
+        urls = [gfg.search_gfg_with_google(topic) for topic in topics]
+    if stage in ("clean", "convert"):
+        articles = [gfg.fetch_gfg_article_html(url, cleaner=None if stage == "clean" else gfg.default_cleaner)
+                    for url in urls]
+    if stage == "clean":
+        soups = [BeautifulSoup(html, HTML_PARSER) for html in articles]
+    requests_before = server.requests
+
+    start = time.perf_counter()
+    if stage == "search":
+        for topic in topics:
+            gfg.search_gfg_with_google(topic)
+    elif stage == "fetch":
+        for url in urls:
+            gfg.fetch_gfg_article_html(url, cleaner=None)
+    elif stage == "clean":
+        for soup in soups:
+            default_cleaner.clean_tree(soup)
+    elif stage == "convert":
+        fragments = build_unit_fragments("Unit", list(zip(topics, urls, articles)))
+        docx_bytes = len(convert_html_to_docx_bytes(fragments).getvalue())
+    elif stage == "unit":
+        rendering = [
+            render_fragments(build_unit_fragments(unit, results))
+            for unit, results in gfg.iter_syllabus_articles(syllabus)
+        ]
+        docx_bytes = sum(len(future.result()[0]) for future in rendering)
+    elif stage == "job":
+        job = NotesJob(syllabus, combined=True).start()
+        job.wait()
+        documents = [job.document(unit) for unit in job.documents] + [job.document()]
+        docx_bytes = sum(len(document) for document in documents if document)
+    seconds = time.perf_counter() - start
+
+    server.stop()
+    return {
+        "stage": stage,
+        "topics": size,
+        "seconds": seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "docx_bytes": docx_bytes,
+        "requests": server.requests - requests_before,
+        "memory_budget_mb": int(os.getenv("NOTES_MEMORY_BUDGET_MB", "0")),
+    }
+
+
+def run_in_child(stage, size, latency, memory_budget_mb=0):
+    """Run a scenario in a fresh interpreter with its own empty cache."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, NOTES_CACHE_DIR=cache_dir, NOTES_HTTP_RATE="100000",
+                   NOTES_MEMORY_BUDGET_MB=str(memory_budget_mb))
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_pipeline", "--child", stage, str(size), str(latency)],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# ----- Reporting -----
+
+def result_key(result):
+    key = f"{result['stage']}:{result['topics']}"
+    # Runs under a memory budget are only compared with runs under the same budget
+    return f"{key}:{result['memory_budget_mb']}MB" if result.get("memory_budget_mb") else key
+
+
+def print_results(results):
+    print(f"{'stage':<8} {'topics':>6} {'wall s':>9} {'ms/topic':>9} {'peak RSS MB':>12} {'DOCX KB':>9} {'requests':>9}")
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.1f}" if r["peak_rss_mb"] is not None else "n/a"
+        docx = f"{r['docx_bytes'] / 1024:.0f}" if r["docx_bytes"] else "-"
+        print(f"{r['stage']:<8} {r['topics']:>6} {r['seconds']:>9.3f} {r['seconds'] * 1000 / r['topics']:>9.1f} "
+              f"{rss:>12} {docx:>9} {r['requests']:>9}")
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Print metrics that got worse than the baseline by more than `tolerance`. Returns their count."""
+    previous = {result_key(r): r for r in baseline}
+    regressions = 0
+    for result in results:
+        old = previous.get(result_key(result))
+        if not old:
+            continue
+        for metric in METRICS:
+            before, after = old.get(metric), result.get(metric)
+            if before and after and after > before * (1 + tolerance):
+                regressions += 1
+                print(f"REGRESSION {result_key(result)} {metric}: {before:.3f} -> {after:.3f} "
+                      f"(+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        _, _, stage, size, latency = sys.argv
+        print(json.dumps(run_scenario(stage, int(size), float(latency))))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES, help="Topic counts (default: 1 10 100)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the replay server adds per response")
+    parser.add_argument("--memory-budget-mb", type=int, default=0,
+                        help="Memory budget of the job stage (default: 0, no budget)")
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed slowdown (default: 0.2)")
+    args = parser.parse_args()
+
+    results = []
+    for stage in args.stages:
+        for size in args.sizes:
+            results.append(run_in_child(stage, size, args.latency, args.memory_budget_mb))
+            print(f"  {stage} x {size} done in {results[-1]['seconds']:.2f} s", file=sys.stderr)
+    print_results(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
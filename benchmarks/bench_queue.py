@@ -0,0 +1,104 @@
+"""
+Throughput of the job queue's worker pool, replayed from recorded GfG fixtures.
+
+Several users each submit notes jobs (units of distinct topics) at once; the
+benchmark starts N worker processes and reports how long the queue takes to
+drain (from the first job claimed), the jobs per minute and the longest wait
+before a user's first job started. Users submit their jobs one after the
+other, so first-come-first-served would keep the last user waiting for every
+other job; fair scheduling starts each user's first job early. Each worker
+count runs in a fresh interpreter with an empty cache and queue.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_queue
+    python -m benchmarks.bench_queue --workers 1 2 4 --jobs 12 --latency 0.05
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+WORKERS = [1, 2, 4]
+JOBS = 8
+USERS = 4
+TOPICS_PER_JOB = 5
+
+
+def run_scenario(workers, threads, jobs, latency):
+    """Drain `jobs` notes jobs with `workers` processes. Returns the result dict."""
+    from benchmarks.gfg_replay import ReplayServer
+
+    server = ReplayServer(latency=latency).start()
+    # Workers are separate interpreters; they find the replay server through the environment
+    os.environ["NOTES_GFG_SEARCH_URL"] = server.search_url
+    from job_queue import default_job_queue, start_workers
+
+    queue = default_job_queue()
+    submitted = []
+    for n in range(jobs):
+        topics = [f"topic {n * TOPICS_PER_JOB + i}" for i in range(TOPICS_PER_JOB)]
+        params = {"syllabus": {f"Unit {n + 1}": topics}, "combined": False, "fmt": "docx", "memory_budget_mb": 0}
+        submitted.append(queue.submit("notes", params, f"user {n * USERS // jobs}"))
+
+    start_workers(workers, threads)
+    while True:
+        finished = [queue.get(job_id) for job_id in submitted]
+        if all(job["finished"] for job in finished):
+            break
+        time.sleep(0.1)
+    # From the first claim, so the workers' own start-up (imports) is not counted
+    start = min(job["started_at"] for job in finished)
+    seconds = max(job["finished_at"] for job in finished) - start
+    first_started = {}
+    for job in finished:
+        first_started[job["user"]] = min(first_started.get(job["user"], job["started_at"]), job["started_at"])
+
+    server.stop()
+    return {
+        "workers": workers,
+        "threads": threads,
+        "jobs": jobs,
+        "failed": sum(job["status"] != "done" for job in finished),
+        "seconds": seconds,
+        "jobs_per_minute": jobs * 60 / seconds,
+        "max_first_wait": max(first_started.values()) - start,
+    }
+
+
+def run_in_child(workers, threads, jobs, latency):
+    """Run a scenario in a fresh interpreter with its own empty cache and queue."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, NOTES_CACHE_DIR=cache_dir, NOTES_HTTP_RATE="100000", NOTES_RENDER_PROCESSES="1")
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_queue", "--child", str(workers), str(threads), str(jobs),
+             str(latency)],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) == 6 and sys.argv[1] == "--child":
+        _, _, workers, threads, jobs, latency = sys.argv
+        print(json.dumps(run_scenario(int(workers), int(threads), int(jobs), float(latency))))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", nargs="+", type=int, default=WORKERS, help="Worker counts (default: 1 2 4)")
+    parser.add_argument("--threads", type=int, default=1, help="Jobs per worker at once (default: 1)")
+    parser.add_argument("--jobs", type=int, default=JOBS, help=f"Notes jobs of {TOPICS_PER_JOB} topics each")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the replay server adds per response")
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'threads':>7} {'jobs':>5} {'failed':>6} {'wall s':>8} {'jobs/min':>9} {'max first wait s':>17}")
+    for workers in args.workers:
+        r = run_in_child(workers, args.threads, args.jobs, args.latency)
+        print(f"{r['workers']:>7} {r['threads']:>7} {r['jobs']:>5} {r['failed']:>6} {r['seconds']:>8.2f} "
+              f"{r['jobs_per_minute']:>9.1f} {r['max_first_wait']:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Check that articles parse into the expected block lists.
+
+Parses small HTML fragments covering the cases the block walker has got
+wrong before and compares the result with the expected blocks. Fails
+(exit status 1) on any difference.
+
+Usage (from the repository root):
+    python -m benchmarks.check_blocks
+"""
+import sys
+
+# (name, HTML fragment, expected blocks)
+CASES = [
+    (
+        "images in nested lists are added once, with their own item",
+        '<ul><li>outer <img src="a.png"><ul><li>inner <img src="b.png"></li></ul></li></ul>',
+        [["li", "ul", 1, "outer"], ["img", "a.png"], ["li", "ul", 2, "inner"], ["img", "b.png"]],
+    ),
+]
+
+
+def main():
+    from notes_blocks import html_to_blocks
+
+    failures = []
+    for name, html, expected in CASES:
+        blocks = html_to_blocks(html)
+        print(f"{'ok  ' if blocks == expected else 'FAIL'} {name}")
+        if blocks != expected:
+            failures.append(f"{name}: got {blocks}, expected {expected}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
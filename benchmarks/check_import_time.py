@@ -0,0 +1,86 @@
+"""
+Check the app's startup imports against an import-time budget.
+
+Runs `python -X importtime` on the modules main.py imports at the top and
+fails (exit status 1) if they take longer than the budget or pull in one of
+the heavy dependencies that should only load when a tab or action needs
+them. The notes utilities are also checked to import without Streamlit.
+Each check is the best of a few runs to smooth out noise.
+
+Usage (from the repository root):
+    python -m benchmarks.check_import_time
+    python -m benchmarks.check_import_time --budget-ms 150 --runs 5
+"""
+import argparse
+import subprocess
+import sys
+
+# Modules main.py imports at module level (besides streamlit and dotenv)
+STARTUP_MODULES = ["job_queue", "metrics", "notes_formats", "notes_jobs"]
+# Modules that can be used from scripts and CLIs without the app
+NOTES_MODULES = [
+    "notes_jobs", "notes_blocks", "notes_formats", "gfg", "html_to_docx", "images", "notes_index", "batch_notes",
+    "job_queue",
+]
+
+BUDGET_MS = 100
+RUNS = 3
+HEAVY_MODULES = ["bs4", "docx", "requests", "httpx", "PIL", "lxml", "numpy", "agno", "groq", "newspaper", "arxiv"]
+
+
+def import_profile(modules):
+    """
+    Import modules in a fresh interpreter.
+    Returns:
+        tuple: (total microseconds for the requested modules, set of all modules imported).
+    """
+    statement = "; ".join(f"import {module}" for module in modules)
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, check=True,
+    ).stderr
+    total, imported = 0, set()
+    for line in stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        imported.add(name.strip())
+        # Nested imports are indented; only count top-level lines to avoid double counting
+        if name.strip() in modules and not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="Startup import budget (default: 100)")
+    parser.add_argument("--runs", type=int, default=RUNS, help="Best of this many runs (default: 3)")
+    args = parser.parse_args()
+
+    failures = []
+    best, imported = min(import_profile(STARTUP_MODULES) for _ in range(args.runs))
+    heavy = sorted(module for module in HEAVY_MODULES if module in imported)
+    print(f"Startup imports ({', '.join(STARTUP_MODULES)}): {best / 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if best / 1000 > args.budget_ms:
+        failures.append(f"startup imports take {best / 1000:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    if heavy:
+        failures.append(f"startup imports load heavy modules: {', '.join(heavy)}")
+
+    for module in NOTES_MODULES:
+        elapsed, imported = import_profile([module])
+        print(f"  {module:<14} {elapsed / 1000:8.1f} ms")
+        if "streamlit" in imported:
+            failures.append(f"{module} imports streamlit")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
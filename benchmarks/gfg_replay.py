@@ -0,0 +1,209 @@
+"""
+Record GfG search results, article pages and images, and replay them from a
+local HTTP server so the pipeline can be benchmarked offline.
+
+Each fixture is a folder under benchmarks/fixtures/gfg/ holding the search
+API answer (search.json), the article page (page.html), its images and a
+fixture.json mapping the original image URLs to the saved files. The replay
+server hands every new search query its own article URL, cycling through the
+fixtures, and rewrites image URLs per article, so N topics cost N searches,
+N article downloads and N sets of image downloads just like the real site.
+
+Usage (from the repository root):
+    python -m benchmarks.gfg_replay record "AVL Tree" "Heap"   # needs network access
+    python -m benchmarks.gfg_replay serve --port 8765           # replay for manual runs
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "gfg")
+CONTENT_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+
+def load_fixtures(fixtures_dir=FIXTURES_DIR):
+    """
+    Load every recorded fixture.
+    Returns:
+        list: Dicts with "search" (parsed JSON), "page" (str) and "images" (original URL -> bytes).
+    """
+    fixtures = []
+    for slug in sorted(os.listdir(fixtures_dir)):
+        folder = os.path.join(fixtures_dir, slug)
+        if not os.path.isfile(os.path.join(folder, "fixture.json")):
+            continue
+        with open(os.path.join(folder, "fixture.json"), encoding="utf-8") as file:
+            meta = json.load(file)
+        with open(os.path.join(folder, "search.json"), encoding="utf-8") as file:
+            search = json.load(file)
+        with open(os.path.join(folder, "page.html"), encoding="utf-8") as file:
+            page = file.read()
+        images = {}
+        for url, path in meta["images"].items():
+            with open(os.path.join(folder, path), "rb") as file:
+                images[url] = file.read()
+        fixtures.append({"slug": slug, "search": search, "page": page, "images": images})
+    return fixtures
+
+
+class ReplayServer:
+    """
+    Serve recorded fixtures on 127.0.0.1.
+
+    /search?query=...      the recorded search answer, pointing at /article/<n>
+    /article/<n>           a recorded page, its image URLs rewritten to /img/<n>/<i>.<ext>
+    /img/<n>/<i>.<ext>     the recorded image bytes
+    `latency` seconds are added to every response to mimic a remote server.
+    """
+
+    def __init__(self, fixtures=None, latency=0.0, port=0):
+        self.fixtures = fixtures if fixtures is not None else load_fixtures()
+        if not self.fixtures:
+            raise ValueError(f"No fixtures found in {FIXTURES_DIR}")
+        self.latency = latency
+        self.requests = 0
+        self._queries = {}  # query -> article number
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def search_url(self):
+        return f"{self.base_url}/search"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _article_number(self, query):
+        with self._lock:
+            return self._queries.setdefault(query, len(self._queries))
+
+    def _fixture(self, number):
+        return self.fixtures[number % len(self.fixtures)]
+
+    def _image_urls(self, number):
+        fixture = self._fixture(number)
+        return {
+            url: f"{self.base_url}/img/{number}/{i}{os.path.splitext(url)[1].lower()}"
+            for i, url in enumerate(fixture["images"])
+        }
+
+    def respond(self, path):
+        """Return (status, content type, body) for a request path."""
+        parts = urlsplit(path)
+        segments = parts.path.strip("/").split("/")
+        if segments[0] == "search":
+            query = parse_qs(parts.query).get("query", [""])[0]
+            number = self._article_number(query)
+            search = json.loads(json.dumps(self._fixture(number)["search"]))
+            search["detail"]["articles"]["data"][0]["post_url"] = f"{self.base_url}/article/{number}"
+            return 200, "application/json", json.dumps(search).encode("utf-8")
+        if segments[0] == "article" and len(segments) == 2 and segments[1].isdigit():
+            number = int(segments[1])
+            page = self._fixture(number)["page"]
+            for url, local_url in self._image_urls(number).items():
+                page = page.replace(url, local_url)
+            return 200, "text/html; charset=utf-8", page.encode("utf-8")
+        if segments[0] == "img" and len(segments) == 3 and segments[1].isdigit():
+            number = int(segments[1])
+            index, extension = os.path.splitext(segments[2])
+            images = list(self._fixture(number)["images"].values())
+            if index.isdigit() and int(index) < len(images):
+                return 200, CONTENT_TYPES.get(extension, "application/octet-stream"), images[int(index)]
+        return 404, "text/plain", b"Not found"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                status, content_type, body = server.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+# ----- Recording -----
+
+def slugify(topic):
+    return re.sub(r"[^a-z0-9]+", "-", topic.lower()).strip("-")
+
+
+def record(topics, fixtures_dir=FIXTURES_DIR):
+    """Save the live search answer, article page and images of each topic as a fixture."""
+    import gfg
+    from bs4 import BeautifulSoup
+    from images import collect_image_urls
+
+    for topic in topics:
+        params = {"products": "articles", "query": topic, "articles_count": 1}
+        search = json.loads(gfg.fetch_bytes(gfg.GFG_SEARCH_URL, params=params))
+        post_url = search["detail"]["articles"]["data"][0]["post_url"]
+        page = gfg.fetch_bytes(post_url).decode("utf-8")
+        article = BeautifulSoup(page, "html.parser").find("article", {"class": "content"})
+        folder = os.path.join(fixtures_dir, slugify(topic))
+        os.makedirs(os.path.join(folder, "images"), exist_ok=True)
+
+        images = {}
+        for url in collect_image_urls(article) if article else []:
+            data = gfg.fetch_bytes(url)
+            if data:
+                name = f"images/{len(images)}{os.path.splitext(url)[1].lower()}"
+                with open(os.path.join(folder, name), "wb") as file:
+                    file.write(data)
+                images[url] = name
+        with open(os.path.join(folder, "search.json"), "w", encoding="utf-8") as file:
+            json.dump(search, file, indent=2, ensure_ascii=False)
+        with open(os.path.join(folder, "page.html"), "w", encoding="utf-8") as file:
+            file.write(page)
+        with open(os.path.join(folder, "fixture.json"), "w", encoding="utf-8") as file:
+            json.dump({"topic": topic, "post_url": post_url, "images": images}, file, indent=2)
+        print(f"Recorded {topic}: {post_url} ({len(images)} images)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="Record topics from the live site")
+    record_parser.add_argument("topics", nargs="+")
+    serve_parser = commands.add_parser("serve", help="Replay the fixtures until interrupted")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.topics)
+        return
+    server = ReplayServer(latency=args.latency, port=args.port).start()
+    print(f"Replaying {len(server.fixtures)} fixtures; search URL: {server.search_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import math
+import threading
+from array import array
+
+# Small CPU-friendly sentence embedding model (384 dimensions)
+EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
+
+_embedder = None
+_embedder_failed = False  # a failed load (missing package, model download) is not retried
+_embedder_lock = threading.Lock()
+
+
+def _load_embedder(model_name):
+    try:
+        from fastembed import TextEmbedding
+    except ImportError:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(model_name, device="cpu")
+        return lambda texts: model.encode(list(texts), normalize_embeddings=True).tolist()
+    model = TextEmbedding(model_name=model_name)
+    return lambda texts: [list(map(float, v)) for v in model.embed(list(texts))]
+
+
+def get_embedder(model_name=EMBEDDING_MODEL):
+    """
+    Return a function mapping a list of texts to a list of embedding vectors, or None.
+
+    Uses fastembed (ONNX, CPU only) when installed, otherwise sentence-transformers.
+    Both are optional; callers treat None as "embeddings unavailable". If neither
+    loads (not installed, or the model cannot be downloaded) this process keeps
+    returning None without trying again.
+    """
+    global _embedder, _embedder_failed
+    with _embedder_lock:
+        if _embedder is None and not _embedder_failed:
+            try:
+                _embedder = _load_embedder(model_name)
+            except Exception:
+                _embedder_failed = True
+        return _embedder
+
+
+def to_blob(vector):
+    """Pack a vector as float32 bytes for storage."""
+    return array("f", vector).tobytes()
+
+
+def from_blob(blob):
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector
+
+
+def cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
@@ -0,0 +1,275 @@
+import json
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+
+from bs4 import BeautifulSoup
+
+import http_client
+from metrics import metrics, span, timed
+from notes_cache import HttpCache
+from search_index import default_search_index
+from text_cleaner import default_cleaner
+
+# GeeksforGeeks internal search API (override, here or with the env variable, to point at a local stub server)
+GFG_SEARCH_URL = os.getenv("NOTES_GFG_SEARCH_URL", "https://recommendations.geeksforgeeks.org/api/v1/global-search")
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+
+# Search hits fetched per topic (in one request) and ranked locally
+SEARCH_CANDIDATES = 5
+
+# Worker threads shared by all topics (per-host limits live in http_client)
+MAX_WORKERS = 16
+
+# Common syllabus abbreviations, expanded word by word before searching
+TOPIC_ALIASES = {
+    "bst": "binary search tree",
+    "avl": "avl tree",
+    "bfs": "breadth first search",
+    "dfs": "depth first search",
+    "dp": "dynamic programming",
+    "mst": "minimum spanning tree",
+    "lcs": "longest common subsequence",
+    "dbms": "database management system",
+    "os": "operating system",
+    "oop": "object oriented programming",
+    "oops": "object oriented programming",
+}
+
+# Shared on-disk cache for search results, articles and images
+cache = HttpCache()
+metrics.add_collector(
+    lambda: {f"http_cache_{name}": value for name, value in cache.stats().items()}
+)
+
+
+def fetch_bytes(url, params=None, headers=HEADERS, max_bytes=None):
+    """Fetch a URL through the on-disk cache. Returns the body, or None on a non-200 answer."""
+    fetch = partial(http_client.get, max_bytes=max_bytes) if max_bytes else http_client.get
+    return cache.get(url, fetch, params=params, headers=headers)
+
+
+@timed("gfg_search")
+def search_gfg_candidates(query, count=SEARCH_CANDIDATES):
+    """
+    Search GeeksforGeeks articles using their internal API.
+    Returns:
+        list: Up to `count` {"url", "title"} hits in GfG's order (empty on failure).
+    """
+    params = {"products": "articles", "query": query, "articles_count": count}
+    try:
+        data = json.loads(fetch_bytes(GFG_SEARCH_URL, params=params))
+        hits = data['detail']['articles']['data']
+        return [
+            {"url": hit['post_url'], "title": hit.get('post_title') or hit.get('title') or ""}
+            for hit in hits[:count] if hit.get('post_url')
+        ]
+    except (*http_client.TRANSPORT_ERRORS, ValueError, KeyError, IndexError, TypeError, AttributeError):
+        return []
+
+
+def search_gfg_with_google(query, context=""):
+    """
+    Find the best GfG article for a topic.
+
+    The top candidates are fetched in one request, stored in the local search
+    index and ranked against the topic and `context` (the unit name and its
+    other topics). Later calls, and manual overrides set through the index,
+    need no new search.
+    Returns:
+        str: Article URL, or None if nothing was found.
+    """
+    key = normalize_topic(query)
+    index = default_search_index()
+    url = index.best(key, context)
+    if url:
+        return url
+    candidates = search_gfg_candidates(query)
+    if not candidates:
+        return None
+    index.put(key, candidates)
+    return index.best(key, context)
+
+
+def fetch_gfg_article_html(url, cleaner=default_cleaner):
+    """
+    Fetch and parse the HTML content of a GFG article.
+    Args:
+        url (str): URL of the GFG article.
+        cleaner (TextCleaner): Applied to the article's text nodes; None to keep the text as is.
+    Returns:
+        str: Cleaned HTML content of the article, or None if it has no article body.
+    """
+    try:
+        with span("gfg_article_download"):
+            body = fetch_bytes(url)
+    except http_client.TRANSPORT_ERRORS:
+        return None
+    if body is None:
+        return None
+    with span("gfg_article_clean"):
+        soup = BeautifulSoup(body, 'html.parser')
+        article = soup.find('article', {'class': 'content'})
+        if not article:
+            return None
+
+        # Remove unwanted elements (e.g., ads, share buttons)
+        for element in article.find_all(['script', 'style', 'nav', 'footer', 'aside', 'form']):
+            element.decompose()
+        if cleaner is not None:
+            cleaner.clean_tree(article)
+        return str(article)
+
+
+def normalize_topic(topic):
+    """
+    Reduce a topic name to the key its search is stored and shared under, so
+    spellings of the same topic ("BST", "Binary Search Tree", "binary-search
+    tree") share one search. The search itself uses the topic as written.
+    """
+    words = re.sub(r"[^\w+#]+", " ", topic.lower()).split()
+    query = " ".join(TOPIC_ALIASES.get(word, word) for word in words)
+    # "AVL Tree" expands to "avl tree tree"
+    return re.sub(r"\b(\w+)( \1\b)+", r"\1", query)
+
+
+def plan_syllabus(syllabus):
+    """
+    Group every (unit, topic) of a syllabus by its normalized search query.
+    Returns:
+        dict: Query -> list of (unit, topic), in syllabus order.
+    """
+    plan = {}
+    for unit, topics in syllabus.items():
+        for topic in topics:
+            plan.setdefault(normalize_topic(topic), []).append((unit, topic))
+    return plan
+
+
+class _Once:
+    """
+    Run a function at most once per key and share its result with every caller.
+    The first caller runs it inline; concurrent callers for the same key wait.
+    Each caller releases the key when done with the result, which is dropped
+    once every caller has released it (a later call runs the function again).
+    """
+
+    def __init__(self):
+        self._futures = {}  # key -> [future, callers that have not released it]
+        self._runs = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Number of times a function was run."""
+        return self._runs
+
+    def __call__(self, key, func, *args):
+        with self._lock:
+            entry = self._futures.get(key)
+            owner = entry is None
+            if owner:
+                entry = self._futures[key] = [Future(), 0]
+                self._runs += 1
+            entry[1] += 1
+        future = entry[0]
+        if owner:
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def release(self, key):
+        with self._lock:
+            entry = self._futures.get(key)
+            if entry is not None:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del self._futures[key]
+
+
+def iter_syllabus_articles(syllabus, max_workers=MAX_WORKERS, on_topic=None, stats=None):
+    """
+    Search and fetch every topic of every unit concurrently, yielding units as they complete.
+
+    Topics are planned first: each normalized query is searched once and each
+    distinct article URL is fetched and cleaned once, however many units (or
+    spellings) it appears under. Repeated topics share the same article string.
+    Results are released once every unit using them has been yielded; a URL
+    found again after that is cleaned again from the on-disk cache.
+    Args:
+        syllabus (dict): Unit name -> list of topic names.
+        max_workers (int): Size of the shared thread pool.
+        on_topic (callable): Called as on_topic(unit, topic, url) from a worker thread
+            whenever a topic finishes, in completion order.
+        stats (dict): If given, filled with "topics", "searches", "articles" and
+            "fetches_saved" once every unit has been yielded.
+    Yields:
+        tuple: (unit, [(topic, url, article_html), ...]) in syllabus order. All topics are
+        submitted up front, so later units keep downloading while earlier ones are consumed.
+    """
+    plan = plan_syllabus(syllabus)
+    articles = _Once()
+    # Candidates are ranked against the unit the topic first appears in
+    contexts = {
+        query: " ".join([str(unit), *syllabus[unit]]) for query, [(unit, _), *_] in plan.items()
+    }
+
+    def resolve(query):
+        # The normalized query only groups spellings; GfG is searched with the topic as written
+        topic = plan[query][0][1]
+        url = search_gfg_with_google(topic, contexts[query])
+        if not url:
+            return None, None
+        return url, articles(url, fetch_gfg_article_html, url)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        for query, occurrences in plan.items():
+            futures[query] = future = pool.submit(resolve, query)
+            if on_topic:
+                for unit, topic in occurrences:
+                    future.add_done_callback(
+                        lambda f, unit=unit, topic=topic: on_topic(unit, topic, f.result()[0])
+                    )
+        # A query's result is dropped once every unit using it has been yielded, so
+        # consumed articles are not kept alive until the whole syllabus is done
+        remaining = {query: len(occurrences) for query, occurrences in plan.items()}
+        found = 0
+        for unit, topics in syllabus.items():
+            results = []
+            for topic in topics:
+                query = normalize_topic(topic)
+                url, article_html = futures[query].result()
+                results.append((topic, url, article_html))
+                remaining[query] -= 1
+                if not remaining[query]:
+                    del futures[query]
+                    if url:
+                        found += len(plan[query])
+                        articles.release(url)
+            yield unit, results
+
+    if stats is not None:
+        topics = sum(len(occurrences) for occurrences in plan.values())
+        stats.update({
+            "topics": topics,
+            "searches": len(plan),
+            "articles": len(articles),
+            "fetches_saved": (topics - len(plan)) + (found - len(articles)),
+        })
+
+
+def fetch_syllabus_articles(syllabus, max_workers=MAX_WORKERS, stats=None):
+    """
+    Search and fetch every topic of every unit concurrently.
+    Args:
+        syllabus (dict): Unit name -> list of topic names.
+        max_workers (int): Size of the shared thread pool.
+        stats (dict): Filled with the fetch plan summary, as in iter_syllabus_articles.
+    Returns:
+        dict: Unit name -> list of (topic, url, article_html), in syllabus order.
+    """
+    return dict(iter_syllabus_articles(syllabus, max_workers, stats=stats))
@@ -0,0 +1,208 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from io import BytesIO
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.shared import Inches
+
+from images import MAX_WORKERS, downloaded_image, is_supported_image, optimize_image
+from metrics import incr, span
+from notes_blocks import blocks_digest, fragments_to_sections, image_urls
+
+
+class ConvertedCache(OrderedDict):
+    """
+    Size-bounded `converted` cache for DocxBuilder: the oldest sections are
+    dropped once their images, plus a rough allowance per element, take more
+    than `max_bytes`.
+    """
+
+    ELEMENT_BYTES = 2048  # rough in-memory size of one paragraph's XML
+
+    def __init__(self, max_bytes):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.size = 0
+
+    def _entry_size(self, entry):
+        elements, image_blobs = entry
+        return len(elements) * self.ELEMENT_BYTES + sum(len(blob) for blob in image_blobs.values())
+
+    def __setitem__(self, key, entry):
+        super().__setitem__(key, entry)
+        self.size += self._entry_size(entry)
+        while self.size > self.max_bytes and len(self) > 1:
+            _, oldest = self.popitem(last=False)
+            self.size -= self._entry_size(oldest)
+
+
+class DocxBuilder:
+    """
+    Build one DOCX document from a sequence of block lists (see notes_blocks).
+
+    HTML fragments added with add_html are parsed into blocks through the
+    block cache, so an article is only ever parsed once. Images are
+    downloaded and optimized in the background as soon as their section is
+    added, once per URL.
+
+    A section that was already rendered (the same article under another
+    unit or spelling) is not rendered again: the body elements it produced
+    are copied instead. Pass the same `converted` dict to several builders to
+    reuse them across documents. Images already downloaded elsewhere (e.g.
+    by the parent of a render process) can be passed in as `images`, as
+    bytes or as paths of the files they were spilled to.
+    """
+
+    def __init__(self, image_width=Inches(4.5), image_report=None, max_workers=MAX_WORKERS, converted=None,
+                 images=None):
+        self.doc = Document()
+        self.image_width = image_width
+        self.image_report = image_report if image_report is not None else {}
+        self.image_report.setdefault("original_bytes", 0)
+        self.image_report.setdefault("optimized_bytes", 0)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._images = {}  # URL -> future of optimized bytes
+        self._downloaded = images if images is not None else {}  # URL -> original bytes, file path or None
+        self._report_lock = threading.Lock()
+        self.converted = converted if converted is not None else {}  # section hash -> (elements, image blobs)
+        self.reused_fragments = 0
+
+    def add_html(self, html):
+        """Parse one HTML fragment (or take its cached blocks) and append it to the document."""
+        self.add_blocks(fragments_to_sections(html)[0])
+
+    def add_blocks(self, blocks):
+        """Append one section's blocks to the document."""
+        key = blocks_digest(blocks)
+        if key in self.converted:
+            self._copy_blocks(*self.converted[key])
+            self.reused_fragments += 1
+            incr("docx_fragments_reused")
+            return
+        body = self.doc.element.body
+        start = len(body) - 1  # new elements go before the trailing section properties
+        for url in image_urls(blocks):
+            if is_supported_image(url) and url not in self._images:
+                self._images[url] = self._pool.submit(self._load_image, url)
+        with span("docx_convert"):
+            for block in blocks:
+                self._add_block(block)
+        elements = [deepcopy(element) for element in body[start:len(body) - 1]]
+        self.converted[key] = (elements, self._image_blobs(elements))
+
+    def save(self, target):
+        """Save the document to a path or file-like object."""
+        self._pool.shutdown(wait=True)
+        with span("docx_save"):
+            self.doc.save(target)
+
+    def to_bytes(self):
+        output = BytesIO()
+        self.save(output)
+        output.seek(0)
+        return output
+
+    def _image_blobs(self, elements):
+        """Map the relationship ids of pictures in `elements` to their image bytes."""
+        blobs = {}
+        for element in elements:
+            for blip in element.iter(qn("a:blip")):
+                r_id = blip.get(qn("r:embed"))
+                blobs[r_id] = self.doc.part.related_parts[r_id].blob
+        return blobs
+
+    def _copy_blocks(self, elements, image_blobs):
+        # Relationship ids are per document; re-add (or find) each image in this one
+        r_ids = {old: self.doc.part.get_or_add_image(BytesIO(blob))[0] for old, blob in image_blobs.items()}
+        section = self.doc.element.body.sectPr
+        for element in elements:
+            element = deepcopy(element)
+            for blip in element.iter(qn("a:blip")):
+                blip.set(qn("r:embed"), r_ids[blip.get(qn("r:embed"))])
+            for doc_pr in element.iter(qn("wp:docPr")):
+                doc_pr.set("id", str(self.doc.part.next_id))
+            section.addprevious(element)
+
+    def _load_image(self, url):
+        data = downloaded_image(self._downloaded, url)
+        if not data:
+            return None
+        optimized = optimize_image(data, width_inches=self.image_width.inches)
+        with self._report_lock:
+            self.image_report["original_bytes"] += len(data)
+            self.image_report["optimized_bytes"] += len(optimized)
+        return optimized
+
+    def _add_block(self, block):
+        kind = block[0]
+        if kind == "h":
+            self.doc.add_heading(block[2], level=block[1])
+        elif kind == "p":
+            self.doc.add_paragraph(block[1])
+        elif kind == "li":
+            _, list_kind, level, text = block
+            style = "List Bullet" if list_kind == "ul" else "List Number"
+            self.doc.add_paragraph(text, style=style if level == 1 else f"{style} {level}")
+        elif kind == "img":
+            self._add_image(block[1])
+        elif kind == "code":
+            self._add_code(block[1])
+
+    def _add_image(self, url):
+        future = self._images.get(url)
+        data = future.result() if future else None
+        if data:
+            self.doc.add_picture(BytesIO(data), width=self.image_width)
+            self.doc.add_paragraph("\n")
+
+    def _add_code(self, code_text):
+        # Add code block with Lucida Console font and a light gray background.
+        para = self.doc.add_paragraph(code_text)
+        if para.runs:
+            para.runs[0].font.name = "Lucida Console"
+        shading_elm = parse_xml(r'<w:shd {} w:fill="EAEAEA"/>'.format(nsdecls('w')))
+        para._element.get_or_add_pPr().append(shading_elm)
+
+
+def convert_html_to_docx_bytes(fragments, image_report=None, converted=None):
+    """
+    Convert HTML content to a DOCX file in memory (BytesIO object).
+    Articles are parsed into blocks (or taken from the block cache) and the
+    blocks rendered to DOCX; see notes_formats for the other formats.
+    Args:
+        fragments (str | list): One HTML string, or a list of per-topic fragments.
+        image_report (dict): If given, filled with the original and optimized image byte totals.
+        converted (dict): Rendered-section cache shared with other documents (see DocxBuilder).
+    Returns:
+        BytesIO: The saved document, positioned at the start.
+    """
+    builder = DocxBuilder(image_report=image_report, converted=converted)
+    for blocks in fragments_to_sections(fragments):
+        builder.add_blocks(blocks)
+    return builder.to_bytes()
+
+
+def render_docx_bytes(sections, images=None, converted=None, output=None):
+    """
+    Process-pool worker: render block lists to a DOCX.
+    Args:
+        sections (list): Block lists in document order.
+        images (dict): URL -> downloaded image bytes or spilled file path (None if the
+            download failed); images not listed are fetched by the worker itself.
+        converted (dict): Rendered-section cache, when rendering in the calling process.
+        output (file): If given, the document is saved here instead of returned as bytes.
+    Returns:
+        tuple: (DOCX bytes or `output`, image report).
+    """
+    image_report = {}
+    builder = DocxBuilder(image_report=image_report, converted=converted, images=images)
+    for blocks in sections:
+        builder.add_blocks(blocks)
+    if output is not None:
+        builder.save(output)
+        return output, image_report
+    return builder.to_bytes().getvalue(), image_report
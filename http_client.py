@@ -0,0 +1,193 @@
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import incr
+
+# httpx with the h2 extra gives us HTTP/2; fall back to requests otherwise
+try:
+    import h2  # noqa: F401
+    import httpx
+    HAS_HTTP2 = True
+except ImportError:
+    httpx = None
+    HAS_HTTP2 = False
+
+# Defaults, overridable through the environment
+CONNECT_TIMEOUT = float(os.getenv("NOTES_HTTP_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.getenv("NOTES_HTTP_READ_TIMEOUT", 20))
+MAX_RETRIES = int(os.getenv("NOTES_HTTP_RETRIES", 4))
+BACKOFF_BASE = 0.5  # seconds, doubled on every retry
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+POOL_SIZE = 32  # keep-alive connections per host
+PER_HOST_LIMIT = 4  # requests in flight per host
+RATE_PER_HOST = float(os.getenv("NOTES_HTTP_RATE", 8))  # requests per second per host
+BURST_PER_HOST = 8
+CHUNK_SIZE = 64 * 1024
+
+# Bodies are always read fully (or up to a cap) before the connection is released
+Response = namedtuple("Response", ["status_code", "headers", "content"])
+
+
+class ResponseTooLarge(Exception):
+    """Raised when a body grows past the caller's `max_bytes` cap."""
+
+if HAS_HTTP2:
+    TRANSPORT_ERRORS = (requests.RequestException, httpx.HTTPError)
+else:
+    TRANSPORT_ERRORS = (requests.RequestException,)
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HttpClient:
+    """
+    One pooled HTTP client shared by every fetch function.
+
+    Connections are kept alive (HTTP/2 when httpx and h2 are installed),
+    each host gets a token-bucket rate limit and a cap on requests in flight,
+    and 429/5xx answers or transport errors are retried with jittered
+    exponential backoff.
+    """
+
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 retries=MAX_RETRIES, rate=RATE_PER_HOST, burst=BURST_PER_HOST,
+                 per_host=PER_HOST_LIMIT, pool_size=POOL_SIZE, http2=HAS_HTTP2):
+        self.retries = retries
+        self.rate = rate
+        self.burst = burst
+        self.per_host = per_host
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+        if http2 and HAS_HTTP2:
+            self._session = httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            )
+            self._timeout = None
+        else:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+            self._timeout = (connect_timeout, read_timeout)
+
+    def _host(self, url):
+        """Return the (rate limiter, concurrency semaphore) pair for the URL's host."""
+        host = urlsplit(url).netloc
+        with self._hosts_lock:
+            if host not in self._hosts:
+                self._hosts[host] = (
+                    TokenBucket(self.rate, self.burst),
+                    threading.BoundedSemaphore(self.per_host),
+                )
+            return self._hosts[host]
+
+    def _send(self, url, params, headers, max_bytes):
+        """Stream one GET and read its body, stopping early past `max_bytes`."""
+        if self._timeout is None:
+            with self._session.stream("GET", url, params=params, headers=headers) as response:
+                content = _read_capped(response.iter_bytes(CHUNK_SIZE), max_bytes, url)
+                return Response(response.status_code, response.headers, content)
+        with self._session.get(url, params=params, headers=headers,
+                               timeout=self._timeout, stream=True) as response:
+            content = _read_capped(response.iter_content(CHUNK_SIZE), max_bytes, url)
+            return Response(response.status_code, response.headers, content)
+
+    def get(self, url, params=None, headers=None, max_bytes=None):
+        """
+        GET a URL with rate limiting and retries.
+        Returns:
+            Response: The final response; it may still carry a 429/5xx status
+            once retries are exhausted.
+        Raises:
+            One of TRANSPORT_ERRORS if the last attempt fails to connect.
+            ResponseTooLarge if the body exceeds `max_bytes`.
+        """
+        bucket, in_flight = self._host(url)
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries + 1):
+            if attempt:
+                incr("http_retries", host=host)
+            bucket.acquire()
+            try:
+                with in_flight:
+                    response = self._send(url, params, headers, max_bytes)
+            except TRANSPORT_ERRORS:
+                if attempt == self.retries:
+                    raise
+                time.sleep(_backoff(attempt))
+                continue
+            incr("http_requests", host=host)
+            incr("http_response_bytes", len(response.content), host=host)
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                return response
+            time.sleep(_retry_after(response) or _backoff(attempt))
+
+
+def _backoff(attempt):
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _read_capped(chunks, max_bytes, url):
+    body = bytearray()
+    for chunk in chunks:
+        body += chunk
+        if max_bytes is not None and len(body) > max_bytes:
+            raise ResponseTooLarge(f"{url} is larger than {max_bytes} bytes")
+    return bytes(body)
+
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After")
+    if value and value.isdigit():
+        return min(BACKOFF_MAX, float(value))
+    return None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def default_client():
+    """Return the process-wide HttpClient, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def get(url, params=None, headers=None, max_bytes=None):
+    return default_client().get(url, params=params, headers=headers, max_bytes=max_bytes)
@@ -0,0 +1,147 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import http_client
+from gfg import fetch_bytes
+from metrics import timed
+
+# Pillow is optional: without it images are embedded as downloaded
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Formats python-docx can embed, and the largest image we are willing to download
+IMAGE_EXTENSIONS = ["png", "jpg", "jpeg"]
+MAX_IMAGE_BYTES = 8 * 1024 * 1024
+MAX_WORKERS = 16
+
+
+def is_supported_image(url):
+    return bool(url) and url.split(".")[-1].lower() in IMAGE_EXTENSIONS
+
+
+def collect_image_urls(soup):
+    """
+    Collect every embeddable image URL in a parsed document.
+    Args:
+        soup (BeautifulSoup): Parsed HTML of one or more articles.
+    Returns:
+        list: Unique image URLs in document order.
+    """
+    urls = (img.get('src') for img in soup.find_all('img'))
+    return list(dict.fromkeys(url for url in urls if is_supported_image(url)))
+
+
+@timed("image_fetch")
+def fetch_image(url):
+    """Download one image (through the cache), or return None if it fails or is too large."""
+    try:
+        return fetch_bytes(url, max_bytes=MAX_IMAGE_BYTES)
+    except (*http_client.TRANSPORT_ERRORS, http_client.ResponseTooLarge) as e:
+        print(f"Failed to download image {url}: {e}")
+        return None
+
+
+def fetch_images(urls, max_workers=MAX_WORKERS):
+    """
+    Download images concurrently, once per unique URL.
+    Returns:
+        dict: URL -> image bytes, for the images that downloaded successfully.
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        results = pool.map(fetch_image, urls)
+        return {url: data for url, data in zip(urls, results) if data}
+
+
+def spill_images(urls, directory, max_workers=MAX_WORKERS):
+    """
+    Like fetch_images, but write each image to a file in `directory` as soon as it
+    is downloaded, so a unit's images never sit in memory together.
+    Returns:
+        dict: URL -> file path, for the images that downloaded successfully.
+    """
+    def spill(numbered):
+        number, url = numbered
+        data = fetch_image(url)
+        if not data:
+            return None
+        path = os.path.join(directory, f"{number}.{url.split('.')[-1].lower()}")
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        paths = pool.map(spill, enumerate(urls))
+        return {url: path for url, path in zip(urls, paths) if path}
+
+
+def downloaded_image(images, url):
+    """
+    Bytes of an image from a fetch_images or spill_images result, downloading it
+    if it is not there. Returns None if the download failed.
+    """
+    data = images[url] if url in images else fetch_image(url)
+    if isinstance(data, str):
+        with open(data, "rb") as file:
+            return file.read()
+    return data
+
+
+# ----- Downscaling and recompression -----
+
+# Images are resized to the width they are shown at in the document (4.5in) at this DPI
+DISPLAY_WIDTH_INCHES = 4.5
+PRINT_DPI = 150
+JPEG_QUALITY = 80
+# "auto" keeps PNG for images with transparency or a palette (diagrams), JPEG otherwise
+IMAGE_FORMAT = "auto"
+
+
+@timed("image_optimize")
+def optimize_image(data, width_inches=DISPLAY_WIDTH_INCHES, dpi=PRINT_DPI,
+                   quality=JPEG_QUALITY, image_format=IMAGE_FORMAT):
+    """
+    Resize an image to the target print width and recompress it.
+    Args:
+        data (bytes): Original PNG/JPEG bytes.
+        width_inches (float): Width the image is displayed at in the document.
+        dpi (int): Target print resolution.
+        quality (int): JPEG quality (1-95).
+        image_format (str): "auto", "PNG" or "JPEG".
+    Returns:
+        bytes: The smaller of the recompressed image and the original.
+    """
+    if Image is None:
+        return data
+    try:
+        image = Image.open(BytesIO(data))
+        image.load()
+    except Exception:
+        return data
+
+    max_width = int(width_inches * dpi)
+    if image.width > max_width:
+        height = max(1, round(image.height * max_width / image.width))
+        image = image.resize((max_width, height), Image.LANCZOS)
+
+    if image_format == "auto":
+        keep_png = image.mode in ("P", "LA", "RGBA", "1") or "transparency" in image.info
+        image_format = "PNG" if keep_png else "JPEG"
+
+    output = BytesIO()
+    if image_format == "JPEG":
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(output, "PNG", optimize=True)
+    optimized = output.getvalue()
+    return optimized if len(optimized) < len(data) else data
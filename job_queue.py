@@ -0,0 +1,619 @@
+"""
+Local job queue shared by every app session, backed by SQLite.
+
+Sessions submit jobs (syllabus notes, agent answers) and poll them; a pool of
+worker processes claims and runs them. Scheduling is fair per user: the next
+job goes to the user with the fewest jobs running, then to whoever was served
+least recently, so one student's long syllabus does not hold up everyone
+else. Submitting a job identical to one that is queued or running returns
+that job, and finished notes jobs are reused for a day, so their documents
+are shared across sessions and survive page reloads. Agent jobs carry the
+user's Groq API key, stored only until a worker claims the job and at most
+SECRET_TTL (ten minutes); finished jobs and their artifacts are removed
+after a week.
+
+Usage (from the repository root):
+    python job_queue.py work --workers 4   # run workers without the app (set NOTES_QUEUE_WORKERS=0 for it)
+    python job_queue.py status             # jobs per status and user
+"""
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+from metrics import incr, metrics, span
+from notes_cache import CACHE_DIR
+
+# Worker processes the app starts; 0 leaves the work to `python job_queue.py work`
+QUEUE_WORKERS = int(os.getenv("NOTES_QUEUE_WORKERS", "2"))
+# Jobs one worker process runs at once (they mostly wait on the network)
+WORKER_THREADS = int(os.getenv("NOTES_QUEUE_THREADS", "4"))
+RESULT_TTL = 24 * 3600  # finished jobs answer identical submissions for a day
+ARTIFACT_TTL = 7 * 24 * 3600  # then their rows and files are removed after a week
+POLL_SECONDS = 0.5  # how often idle workers look for jobs and running jobs report progress
+STALE_SECONDS = 60  # running jobs without a heartbeat for this long are queued again
+METRICS_SECONDS = 2  # how often workers publish their metrics (and heartbeats) for the app's debug panel
+# API keys are kept (in plain text) only until a worker claims the job; jobs
+# still unclaimed after this long fail and their key is erased
+SECRET_TTL = 10 * 60
+ARTIFACTS_DIR = os.path.join(CACHE_DIR, "artifacts")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    user TEXT NOT NULL,
+    job_key TEXT NOT NULL,
+    params TEXT NOT NULL,
+    secret TEXT,
+    status TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT '{}',
+    error TEXT,
+    worker TEXT,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, submitted_at);
+CREATE INDEX IF NOT EXISTS jobs_key ON jobs (job_key, status);
+CREATE TABLE IF NOT EXISTS worker_metrics (
+    worker TEXT PRIMARY KEY,
+    series TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    reset INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+ACTIVE = ("queued", "running")
+
+
+def _row(row):
+    job = dict(row)
+    job.pop("secret", None)  # never leaves the queue except through claim()
+    job["params"] = json.loads(job["params"])
+    job["state"] = json.loads(job["state"])
+    job["finished"] = job["status"] not in ACTIVE
+    return job
+
+
+class JobQueue:
+    """
+    SQLite table of jobs, safe to share between threads and processes.
+
+    A job is a kind (see HANDLERS), JSON parameters and the user who
+    submitted it. Workers write its progress and results to `state` (JSON);
+    an optional secret (the user's API key) is handed to the worker that
+    claims the job and then cleared. It is never kept longer than SECRET_TTL:
+    a job with a secret that no worker claimed in time fails instead.
+    """
+
+    def __init__(self, path=None, result_ttl=RESULT_TTL):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "jobs.sqlite3")
+        self.result_ttl = result_ttl
+        self._lock = threading.Lock()
+        # Autocommit, so claims can take the write lock up front with BEGIN IMMEDIATE
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    @staticmethod
+    def make_key(kind, params):
+        # Not sorted: unit order is part of a syllabus
+        return hashlib.sha256(f"{kind}:{json.dumps(params)}".encode("utf-8")).hexdigest()
+
+    def submit(self, kind, params, user, secret=None, reuse=True):
+        """
+        Queue a job, or return the identical one already queued, running or (with
+        `reuse`) finished successfully within the result TTL.
+        Returns:
+            int: Job id.
+        """
+        key = self.make_key(kind, params)
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                # Also here, not only in the workers' housekeeping: with no worker running nothing else would
+                self._expire_secrets(now)
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE job_key = ? AND (status IN ('queued', 'running')"
+                    " OR (? AND status = 'done' AND finished_at > ?)) ORDER BY id DESC LIMIT 1",
+                    (key, reuse, now - self.result_ttl),
+                ).fetchone()
+                if row:
+                    incr("queue_deduplicated", kind=kind)
+                    return row["id"]
+                job_id = self._db.execute(
+                    "INSERT INTO jobs (kind, user, job_key, params, secret, status, submitted_at)"
+                    " VALUES (?, ?, ?, ?, ?, 'queued', ?)",
+                    (kind, user, key, json.dumps(params), secret, now),
+                ).lastrowid
+            finally:
+                self._db.execute("COMMIT")
+        incr("queue_submitted", kind=kind)
+        return job_id
+
+    def get(self, job_id):
+        """The job as a dict (params and state decoded, plus "finished"), or None."""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row(row) if row else None
+
+    def position(self, job_id):
+        """How many queued jobs were submitted before this one."""
+        with self._lock:
+            (ahead,) = self._db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND id < ?", (job_id,)
+            ).fetchone()
+        return ahead
+
+    def claim(self, worker):
+        """
+        Take the next job, fairly between users: fewest running jobs first, then
+        the user served least recently, then the oldest job.
+        Returns:
+            tuple: (job dict, secret), or None if nothing is queued.
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    """
+                    SELECT q.* FROM jobs q WHERE q.status = 'queued'
+                    ORDER BY
+                        (SELECT COUNT(*) FROM jobs r WHERE r.user = q.user AND r.status = 'running'),
+                        COALESCE((SELECT MAX(s.started_at) FROM jobs s WHERE s.user = q.user), 0),
+                        q.id
+                    LIMIT 1
+                    """
+                ).fetchone()
+                if row:
+                    self._db.execute(
+                        "UPDATE jobs SET status = 'running', worker = ?, started_at = ?, heartbeat_at = ?,"
+                        " secret = NULL WHERE id = ?",
+                        (worker, now, now, row["id"]),
+                    )
+            finally:
+                self._db.execute("COMMIT")
+        if not row:
+            return None
+        incr("queue_claimed", kind=row["kind"])
+        return _row(row), row["secret"]
+
+    def update(self, job_id, state):
+        """Record a running job's progress (also its heartbeat)."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET state = ?, heartbeat_at = ? WHERE id = ? AND status = 'running'",
+                (json.dumps(state), time.time(), job_id),
+            )
+
+    def heartbeat(self, job_ids):
+        with self._lock:
+            self._db.executemany(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = 'running'",
+                [(time.time(), job_id) for job_id in job_ids],
+            )
+
+    def finish(self, job_id, state, error=None):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, state = ?, error = ?, finished_at = ? WHERE id = ?",
+                ("failed" if error else "done", json.dumps(state or {}), error, time.time(), job_id),
+            )
+
+    def _expire_secrets(self, now, secret_ttl=SECRET_TTL):
+        return self._db.execute(
+            "UPDATE jobs SET secret = NULL, status = 'failed', error = ?, finished_at = ?"
+            " WHERE status = 'queued' AND secret IS NOT NULL AND submitted_at < ?",
+            ("No worker took the job in time (its API key is not kept longer); run it again",
+             now, now - secret_ttl),
+        ).rowcount
+
+    def housekeeping(self, stale_seconds=STALE_SECONDS, artifact_ttl=ARTIFACT_TTL):
+        """
+        Queue again the jobs of workers that stopped, fail jobs whose API key
+        expired unclaimed, and remove old jobs with their artifacts.
+        """
+        now = time.time()
+        with self._lock:
+            self._expire_secrets(now)
+            requeued = self._db.execute(
+                "UPDATE jobs SET status = 'queued', worker = NULL WHERE status = 'running' AND heartbeat_at < ?",
+                (now - stale_seconds,),
+            ).rowcount
+            old = [row["id"] for row in self._db.execute(
+                "SELECT id FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (now - artifact_ttl,)
+            )]
+            self._db.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in old])
+            self._db.execute("DELETE FROM worker_metrics WHERE updated_at < ?", (now - stale_seconds,))
+        for job_id in old:
+            shutil.rmtree(artifacts_dir(job_id), ignore_errors=True)
+        if requeued:
+            incr("queue_requeued", requeued)
+        return requeued, len(old)
+
+    # ----- Worker metrics -----
+
+    def publish_metrics(self, worker, series):
+        """Store a worker process's latest metrics snapshot (see Metrics.snapshot)."""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO worker_metrics (worker, series, updated_at) VALUES (?, ?, ?)"
+                " ON CONFLICT (worker) DO UPDATE SET series = excluded.series, updated_at = excluded.updated_at",
+                (worker, json.dumps(series), time.time()),
+            )
+
+    def worker_metrics(self, max_age=STALE_SECONDS):
+        """The latest series of every live worker, each labelled with its worker as `process`."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT worker, series FROM worker_metrics WHERE updated_at > ? ORDER BY worker",
+                (time.time() - max_age,),
+            ).fetchall()
+        return [
+            {**item, "labels": {**item["labels"], "process": row["worker"]}}
+            for row in rows for item in json.loads(row["series"])
+        ]
+
+    def reset_worker_metrics(self):
+        """Ask every worker to reset its metrics before it next publishes them."""
+        with self._lock:
+            self._db.execute("UPDATE worker_metrics SET reset = 1")
+
+    def take_metrics_reset(self, worker):
+        """Whether a reset was asked for this worker (and clear the request)."""
+        with self._lock:
+            return self._db.execute(
+                "UPDATE worker_metrics SET reset = 0 WHERE worker = ? AND reset = 1", (worker,)
+            ).rowcount > 0
+
+    def stats(self):
+        """Job counts as {status: {user: count}}."""
+        with self._lock:
+            rows = self._db.execute("SELECT status, user, COUNT(*) AS n FROM jobs GROUP BY status, user").fetchall()
+        stats = {}
+        for row in rows:
+            stats.setdefault(row["status"], {})[row["user"]] = row["n"]
+        return stats
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_job_queue():
+    """Return the process-wide JobQueue, creating it on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = JobQueue()
+        return _default
+
+
+def artifacts_dir(job_id):
+    return os.path.join(ARTIFACTS_DIR, str(job_id))
+
+
+# ----- Job kinds -----
+
+def run_notes(job, secret, report):
+    """
+    Generate syllabus notes. Each unit's document and parsed blocks are written
+    to the job's artifacts folder as soon as they are built.
+    """
+    import notes_jobs
+    from notes_blocks import pack_blocks
+    from notes_jobs import NotesJob
+
+    params = job["params"]
+    folder = artifacts_dir(job["id"])
+    os.makedirs(folder, exist_ok=True)
+    fmt = params.get("fmt", "docx")
+    # Units render across this worker's share of the cores (see work())
+    notes = NotesJob(params["syllabus"], combined=params.get("combined", False),
+                     processes=notes_jobs.RENDER_PROCESSES, fmt=fmt,
+                     memory_budget_mb=params.get("memory_budget_mb", 0)).start()
+    files = {"documents": {}, "sections": {}}
+
+    def state():
+        for n, unit in enumerate(notes.syllabus):
+            if unit in notes.documents and unit not in files["documents"]:
+                with open(os.path.join(folder, f"unit_{n}.{fmt}"), "wb") as file:
+                    file.write(notes.document(unit))
+                codec, data = pack_blocks(notes.unit_sections(unit))
+                with open(os.path.join(folder, f"unit_{n}.{codec}"), "wb") as file:
+                    file.write(data)
+                files["documents"][unit] = f"unit_{n}.{fmt}"
+                files["sections"][unit] = f"unit_{n}.{codec}"
+        combined = None
+        if notes.finished and notes.combined_document is not None:
+            combined = f"combined.{fmt}"
+            with open(os.path.join(folder, combined), "wb") as file:
+                file.write(notes.document())
+        return {
+            "progress": notes.progress, "done_topics": notes.done_topics, "total_topics": notes.total_topics,
+            "log": list(notes.log), "documents": dict(files["documents"]), "sections": dict(files["sections"]),
+            "combined": combined, "image_reports": dict(notes.image_reports), "fetch_stats": notes.fetch_stats,
+            "peak_rss_mb": notes.peak_rss_mb, "error": notes.error,
+        }
+
+    while not notes.wait(POLL_SECONDS):
+        report(state())
+    return state()
+
+
+_llm_caches = {}
+
+
+def run_agent(job, secret, report):
+    """Answer with one Study Agent, reporting the text as it streams in."""
+    from agent_tasks import AGENT_STREAMS
+    from llm_cache import LLMResponseCache
+
+    if not secret:
+        raise RuntimeError("no Groq API key (the job was queued again after its worker stopped); run it again")
+    params = job["params"]
+    similar = params.get("similar", False)
+    if similar not in _llm_caches:
+        _llm_caches[similar] = LLMResponseCache(near_duplicates=similar)
+    timings, parts = {}, []
+    start = last_report = time.perf_counter()
+    stream = AGENT_STREAMS[params["agent"]](secret, timings=timings, cache=_llm_caches[similar], **params["inputs"])
+    for delta in stream:
+        parts.append(delta)
+        if time.perf_counter() - last_report > POLL_SECONDS:
+            report({"text": "".join(parts)})
+            last_report = time.perf_counter()
+    timings.setdefault("total", time.perf_counter() - start)
+    return {"text": "".join(parts), "timings": timings}
+
+
+HANDLERS = {"notes": run_notes, "agent": run_agent}
+
+
+# ----- Workers -----
+
+def run_job(queue, job, secret):
+    """Run one claimed job and record its result or error."""
+    def report(state):
+        queue.update(job["id"], state)
+
+    try:
+        with span("queue_job", kind=job["kind"]):
+            state = HANDLERS[job["kind"]](job, secret, report)
+    except Exception as e:
+        queue.finish(job["id"], None, error=f"{type(e).__name__}: {e}")
+        return
+    queue.finish(job["id"], state, error=state.get("error"))
+
+
+def work(threads=WORKER_THREADS, processes=1, stop=None, queue=None):
+    """
+    Claim and run jobs on `threads` threads until `stop` (a threading.Event) is set.
+    `processes` is the number of worker processes sharing the machine, so the
+    Groq request budget and concurrency cap (per key, not per process) and the
+    render processes (NOTES_RENDER_PROCESSES, all cores by default) can be
+    split between them; each process keeps at least one of each.
+    Jobs still running when it returns are queued again by other workers once
+    their heartbeat is stale.
+    """
+    import notes_jobs
+    import study_agents
+
+    share = max(1, processes)
+    study_agents.GROQ_REQUESTS_PER_MINUTE /= share
+    study_agents.GROQ_MAX_CONCURRENCY = max(1, study_agents.GROQ_MAX_CONCURRENCY // share)
+    notes_jobs.RENDER_PROCESSES = max(1, notes_jobs.RENDER_PROCESSES // share)
+    queue = queue or default_job_queue()
+    stop = stop or threading.Event()
+    running = set()
+
+    def loop(n):
+        while not stop.is_set():
+            claimed = queue.claim(f"{os.getpid()}/{n}")
+            if claimed is None:
+                stop.wait(POLL_SECONDS)
+                continue
+            job, secret = claimed
+            running.add(job["id"])
+            try:
+                run_job(queue, job, secret)
+            finally:
+                running.discard(job["id"])
+
+    for n in range(threads):
+        threading.Thread(target=loop, args=(n,), daemon=True).start()
+    # Heartbeats (long model calls report nothing for a while), metrics for the app and housekeeping
+    name = f"worker-{os.getpid()}"
+    housekept_at = 0
+    while not stop.wait(METRICS_SECONDS):
+        queue.heartbeat(list(running))
+        if queue.take_metrics_reset(name):
+            metrics.reset()
+        queue.publish_metrics(name, metrics.snapshot())
+        if time.time() - housekept_at > STALE_SECONDS / 4:
+            queue.housekeeping()
+            housekept_at = time.time()
+
+
+_workers = []
+_workers_started = False  # once per process, even when no workers are configured
+_workers_lock = threading.Lock()
+
+
+def start_workers(processes=QUEUE_WORKERS, threads=WORKER_THREADS):
+    """
+    Start the worker processes of this process, once. Returns how many are running.
+    Workers are separate interpreters running `python job_queue.py worker`, not
+    multiprocessing children: those would re-import the Streamlit script as
+    their __main__. They stop when this process exits.
+    """
+    global _workers_started
+    with _workers_lock:
+        if not _workers_started:
+            _workers_started = True
+            command = [sys.executable, os.path.abspath(__file__), "worker", "--threads", str(threads),
+                       "--share", str(processes), "--parent", str(os.getpid())]
+            _workers.extend(subprocess.Popen(command) for _ in range(processes))
+            atexit.register(stop_workers)
+        return sum(process.poll() is None for process in _workers)
+
+
+def stop_workers():
+    for process in _workers:
+        if process.poll() is None:
+            process.terminate()
+
+
+def _watch_parent(parent, stop):
+    # Stop when the app that started this worker is gone (even if it was killed)
+    while not stop.wait(1):
+        if os.getppid() != parent:
+            stop.set()
+
+
+# ----- Notes jobs as the app sees them -----
+
+class QueuedNotes:
+    """
+    A notes job in the queue, with the attributes and methods of NotesJob that
+    the app reads, so the page works with either. Call refresh() to read the
+    latest state from the queue.
+    """
+
+    def __init__(self, job_id, queue=None):
+        self.id = job_id
+        self.queue = queue or default_job_queue()
+        self._renders = {}  # (format, unit or None) or ("zip", format) -> bytes, kept across reruns
+        self.refresh()
+
+    def refresh(self):
+        job = self.queue.get(self.id)
+        if job is None:
+            raise KeyError(f"No job {self.id} in the queue")
+        params, state = job["params"], job["state"]
+        self.status = job["status"]
+        self.syllabus = params["syllabus"]
+        self.combined = params.get("combined", False)
+        self.fmt = params.get("fmt", "docx")
+        self.memory_budget_mb = params.get("memory_budget_mb", 0)
+        self.total_topics = state.get("total_topics", sum(len(topics) for topics in self.syllabus.values()))
+        self.done_topics = state.get("done_topics", 0)
+        self.progress = 1.0 if job["finished"] else state.get("progress", 0.0)
+        self.log = state.get("log", [])
+        if self.status == "queued":
+            self.log = [f"Waiting for a worker ({self.queue.position(self.id)} jobs ahead)"]
+        self.documents = state.get("documents", {})  # unit -> file name in the artifacts folder
+        self.sections = state.get("sections", {})
+        self.combined_document = state.get("combined")
+        self.image_reports = state.get("image_reports", {})
+        self.fetch_stats = state.get("fetch_stats", {})
+        self.peak_rss_mb = state.get("peak_rss_mb")
+        self.error = job["error"]
+        self.finished = job["finished"]
+        return self
+
+    def _read(self, name):
+        with open(os.path.join(artifacts_dir(self.id), name), "rb") as file:
+            return file.read()
+
+    def document(self, unit=None):
+        name = self.documents.get(unit) if unit is not None else self.combined_document
+        return self._read(name) if name else None
+
+    def unit_sections(self, unit):
+        from notes_blocks import unpack_blocks
+
+        name = self.sections[unit]
+        return unpack_blocks(name.rsplit(".", 1)[1], self._read(name))
+
+    def _memo(self, key, final, build):
+        """
+        Build once what the page asks for on every rerun. Only results that can
+        no longer change (`final`) are kept, and none in low-memory mode, where
+        the page defers downloads instead.
+        """
+        if key in self._renders:
+            return self._renders[key]
+        document = build()
+        if final and not self.memory_budget_mb:
+            self._renders[key] = document
+        return document
+
+    def render(self, fmt, unit=None):
+        """Render finished notes in any format from their parsed blocks, in this process."""
+        from notes_jobs import render_sections
+
+        def build():
+            units = [unit] if unit is not None else [name for name in self.syllabus if name in self.sections]
+            sections = [blocks for name in units for blocks in self.unit_sections(name)]
+            return render_sections(sections, fmt, processes=1, title=unit or "Notes").result()[0]
+
+        # A unit's blocks are final once stored; all units together only once the job is done
+        return self._memo((fmt, unit), unit is not None or self.finished, build)
+
+    def zip_bytes(self, fmt=None):
+        from notes_jobs import zip_documents
+
+        fmt = fmt or self.fmt
+
+        def build():
+            units = [unit for unit in self.syllabus if unit in self.documents]
+            if fmt == self.fmt:
+                return zip_documents({unit: self.document(unit) for unit in units}, fmt)
+            return zip_documents({unit: self.render(fmt, unit) for unit in units}, fmt)
+
+        return self._memo(("zip", fmt), self.finished, build)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    workers = commands.add_parser("work", help="Run worker processes until interrupted")
+    workers.add_argument("--workers", type=int, default=max(1, QUEUE_WORKERS), help="Worker processes")
+    workers.add_argument("--threads", type=int, default=WORKER_THREADS, help="Jobs per worker at once")
+    commands.add_parser("status", help="Show jobs per status and user")
+    # One worker process, as started by start_workers()
+    worker = commands.add_parser("worker")
+    worker.add_argument("--threads", type=int, default=WORKER_THREADS)
+    worker.add_argument("--share", type=int, default=1, help="Worker processes sharing the Groq rate limit")
+    worker.add_argument("--parent", type=int, help="Stop when this process exits")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        for status, users in sorted(default_job_queue().stats().items()):
+            print(f"{status}: " + ", ".join(f"{user} {count}" for user, count in sorted(users.items())))
+        return
+    if args.command == "worker":
+        stop = threading.Event()
+        # Exit through work() on terminate, so the render pool's processes are shut down too
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        if args.parent:
+            threading.Thread(target=_watch_parent, args=(args.parent, stop), daemon=True).start()
+        work(args.threads, args.share, stop)
+        return
+    start_workers(args.workers, args.threads)
+    print(f"{args.workers} workers with {args.threads} threads each; Ctrl+C to stop")
+    try:
+        while any(process.poll() is None for process in _workers):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from embeddings import cosine, from_blob, get_embedder, to_blob
+from metrics import metrics
+from notes_cache import CACHE_DIR
+
+DEFAULT_TTL = float(os.getenv("NOTES_LLM_CACHE_TTL", 24 * 3600))  # one day
+MAX_ENTRIES = 2000
+SIMILARITY_THRESHOLD = 0.97
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    scope TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    response TEXT NOT NULL,
+    embedding BLOB,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_responses_scope ON llm_responses (scope);
+CREATE INDEX IF NOT EXISTS llm_responses_accessed ON llm_responses (accessed_at);
+"""
+
+
+def normalize_prompt(prompt):
+    # Only whitespace is normalized: case matters in URLs and video ids
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def agent_scope(agent):
+    """Identify what produces an answer: model id, agent description and tool set."""
+    tools = sorted(type(tool).__name__ for tool in (agent.tools or []))
+    return "\n".join([agent.model.id, agent.description or "", ",".join(tools)])
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed cache of final agent answers.
+
+    Entries are keyed on the normalized prompt plus the agent scope (model id,
+    description, tools), expire after `ttl` seconds and are evicted least
+    recently used past `max_entries`. With `near_duplicates=True` and a local
+    embedder installed, a miss falls back to the most similar cached prompt in
+    the same scope if its cosine similarity reaches `threshold`.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES,
+                 near_duplicates=False, threshold=SIMILARITY_THRESHOLD):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "llm.sqlite3")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.near_duplicates = near_duplicates
+        self.threshold = threshold
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        metrics.add_collector(
+            lambda: {f"llm_cache_{name}": value for name, value in self.stats().items()},
+            near_duplicates=near_duplicates,
+        )
+
+    @staticmethod
+    def make_key(scope, prompt):
+        return hashlib.sha256(f"{scope}\n{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+    def _embed(self, prompt):
+        embedder = get_embedder() if self.near_duplicates else None
+        return embedder([normalize_prompt(prompt)])[0] if embedder else None
+
+    def get(self, scope, prompt):
+        """Return the cached answer for this prompt and scope, or None."""
+        key = self.make_key(scope, prompt)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response FROM llm_responses WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl),
+            ).fetchone()
+            if row:
+                self.hits += 1
+                self._db.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+                self._db.commit()
+                return row[0]
+
+        vector = self._embed(prompt)
+        if vector is not None:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT key, response, embedding FROM llm_responses "
+                    "WHERE scope = ? AND created_at > ? AND embedding IS NOT NULL",
+                    (scope, now - self.ttl),
+                ).fetchall()
+                scored = [(cosine(vector, from_blob(blob)), key, response) for key, response, blob in rows]
+                best = max(scored, default=None)
+                if best and best[0] >= self.threshold:
+                    self.near_hits += 1
+                    self._db.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, best[1]))
+                    self._db.commit()
+                    return best[2]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, scope, prompt, response):
+        vector = self._embed(prompt)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(scope, prompt), scope, normalize_prompt(prompt), response,
+                 to_blob(vector) if vector is not None else None, now, now),
+            )
+            self._db.execute("DELETE FROM llm_responses WHERE created_at <= ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM llm_responses WHERE key NOT IN "
+                "(SELECT key FROM llm_responses ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def stats(self):
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.near_hits) / lookups if lookups else 0.0,
+        }
+
@@ -0,0 +1,233 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_cache import agent_scope
+from notes_cache import CACHE_DIR
+from study_agents import model_slot, record_run_metrics, stream_agent
+
+# Chunks are sized in (estimated) tokens so each map call fits comfortably in the context
+CHUNK_TOKENS = 3000
+# Partial summaries are merged in groups of this many tokens before the final answer
+REDUCE_TOKENS = 6000
+# Map calls running at once (Groq rate limits apply per key)
+MAX_CONCURRENCY = 4
+# Pages of each arXiv PDF to read
+ARXIV_PAGES = 8
+
+SOURCES_DIR = os.path.join(CACHE_DIR, "sources")
+
+
+# ----- Source text cache -----
+
+def cached_source(kind, source_id, loader):
+    """
+    Return the text for a source, loading and storing it on first use.
+    Args:
+        kind (str): Source type, e.g. "youtube" or "arxiv".
+        source_id (str): Stable id within that type (video id, arXiv id).
+        loader (callable): Returns the text, or None if it could not be loaded (not cached).
+    """
+    name = hashlib.sha256(f"{kind}:{source_id}".encode("utf-8")).hexdigest()
+    path = os.path.join(SOURCES_DIR, f"{name}.txt.gz")
+    if os.path.exists(path):
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            return file.read()
+    text = loader()
+    if text:
+        os.makedirs(SOURCES_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(tmp_path, path)
+    return text
+
+
+def youtube_transcript(url):
+    """Fetch (or load from cache) the captions of a YouTube video. Returns None if unavailable."""
+    from agno.tools.youtube import YouTubeTools
+
+    tools = YouTubeTools()
+    video_id = tools.get_youtube_video_id(url)
+    if not video_id:
+        return None
+
+    def load():
+        captions = tools.get_youtube_video_captions(url)
+        # The tool reports failures as text instead of raising
+        if captions.startswith(("Error", "No captions", "No URL")):
+            return None
+        return captions
+
+    return cached_source("youtube", video_id, load)
+
+
+def arxiv_papers(query, num_papers=5, pages_to_read=ARXIV_PAGES):
+    """
+    Search arXiv and return the text of the top papers.
+    Returns:
+        list: (title, text) tuples; paper text is cached per arXiv id.
+    """
+    from agno.tools.arxiv import ArxivTools
+
+    tools = ArxivTools()
+    papers = json.loads(tools.search_arxiv_and_return_articles(query, num_articles=num_papers))
+
+    def load(paper_id):
+        articles = json.loads(tools.read_arxiv_papers([paper_id], pages_to_read=pages_to_read))
+        pages = articles[0].get("content", []) if articles else []
+        return "\n".join(page["text"] or "" for page in pages) or None
+
+    results = []
+    for paper in papers:
+        text = cached_source("arxiv", f"{paper['id']}:{pages_to_read}", lambda: load(paper["id"]))
+        results.append((paper["title"], text or paper.get("summary", "")))
+    return results
+
+
+# ----- Chunking -----
+
+def estimate_tokens(text):
+    # About four characters per token for English text
+    return len(text) // 4 + 1
+
+
+def chunk_text(text, max_tokens=CHUNK_TOKENS):
+    """Split text into chunks of at most `max_tokens` (estimated), breaking between sentences."""
+    max_chars = max_tokens * 4
+    sentences = re.split(r"(?<=[.!?])\s+|\n{2,}", text)
+    chunks, current = [], ""
+    for sentence in sentences:
+        # Captions often have no punctuation at all; hard-split overly long "sentences"
+        while len(sentence) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+# ----- Map-reduce -----
+
+def _complete(agent_factory, prompt, cache):
+    """One non-streaming LLM call, answered from the cache when possible."""
+    agent = agent_factory()
+    scope = agent_scope(agent)
+    if cache is not None:
+        cached = cache.get(scope, prompt)
+        if cached is not None:
+            return cached
+    with model_slot(agent):
+        start = time.perf_counter()
+        response = agent.run(prompt, markdown=True)
+    record_run_metrics(agent, response, time.perf_counter() - start)
+    content = response.content if response else ""
+    if cache is not None and content:
+        cache.put(scope, prompt, content)
+    return content
+
+
+def map_summaries(agent_factory, instruction, sources, cache=None, max_concurrency=MAX_CONCURRENCY):
+    """
+    Summarize every chunk of every source in parallel.
+    Args:
+        agent_factory (callable): Returns a fresh tool-less agent (agents are not thread-safe).
+        instruction (str): The user's request, repeated in each map prompt.
+        sources (list): (name, text) tuples.
+        cache (LLMResponseCache): Optional answer cache for the map calls.
+        max_concurrency (int): Map calls in flight at once.
+    Returns:
+        list: (name, [partial summaries in order]) tuples.
+    """
+    jobs = []
+    for name, text in sources:
+        chunks = chunk_text(text)
+        for index, chunk in enumerate(chunks, start=1):
+            jobs.append((name, (
+                f"{instruction}\n\nBelow is part {index} of {len(chunks)} of {name}. "
+                f"Summarize the points of this part that matter for the request above.\n\n{chunk}"
+            )))
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        partials = list(pool.map(lambda job: _complete(agent_factory, job[1], cache), jobs))
+
+    grouped = {name: [] for name, _ in sources}
+    for (name, _), partial in zip(jobs, partials):
+        grouped[name].append(partial)
+    return list(grouped.items())
+
+
+def _collapse(agent_factory, instruction, summaries, cache, max_concurrency):
+    """Merge partial summaries in groups until they fit in one reduce prompt."""
+    while estimate_tokens("\n\n".join(summaries)) > REDUCE_TOKENS and len(summaries) > 1:
+        groups, current = [], []
+        for summary in summaries:
+            if current and estimate_tokens("\n\n".join(current + [summary])) > REDUCE_TOKENS:
+                groups.append(current)
+                current = []
+            current.append(summary)
+        groups.append(current)
+        if len(groups) == len(summaries):
+            break  # every summary is already too large to pair up
+        prompts = [
+            f"{instruction}\n\nCombine these partial summaries into one summary, keeping every "
+            f"important point.\n\n" + "\n\n".join(group)
+            for group in groups
+        ]
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            summaries = list(pool.map(lambda prompt: _complete(agent_factory, prompt, cache), prompts))
+    return summaries
+
+
+def stream_long_summary(agent_factory, instruction, sources, timings=None, cache=None,
+                        max_concurrency=MAX_CONCURRENCY):
+    """
+    Summarize long sources with map-reduce and stream the final answer.
+
+    Chunks are summarized in parallel (bounded by `max_concurrency`), partial
+    summaries are merged until they fit one prompt, and the last call is
+    streamed so the user sees tokens as soon as the reduce step starts.
+    Args:
+        agent_factory (callable): Returns a fresh tool-less summarizer agent.
+        instruction (str): The user's request.
+        sources (list): (name, text) tuples, e.g. one transcript or several papers.
+        timings (dict): Filled as in stream_agent, plus "chunks" and "map" seconds.
+        cache (LLMResponseCache): Optional answer cache for all calls.
+    Yields:
+        str: Content deltas of the final answer.
+    """
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
+    if sum(estimate_tokens(text) for _, text in sources) <= REDUCE_TOKENS:
+        # Short input: no map step, the final call reads the text directly
+        timings["chunks"] = 0
+        sections = [f"### {name}\n{text}" for name, text in sources]
+    else:
+        mapped = map_summaries(agent_factory, instruction, sources, cache, max_concurrency)
+        timings["chunks"] = sum(len(partials) for _, partials in mapped)
+        sections = []
+        for name, partials in mapped:
+            merged = _collapse(agent_factory, instruction, partials, cache, max_concurrency)
+            sections.append(f"### {name}\n" + "\n\n".join(merged))
+        sections = _collapse(agent_factory, instruction, sections, cache, max_concurrency)
+    timings["map"] = time.perf_counter() - start
+
+    prompt = (
+        f"{instruction}\n\nAnswer using these summaries of the source material:\n\n"
+        + "\n\n".join(sections)
+    )
+    yield from stream_agent(agent_factory(), prompt, timings, cache=cache)
+    # Report latency from the user's click, not from the start of the reduce call
+    timings["ttft"] = timings.get("ttft", 0.0) + timings["map"]
+    timings["total"] = time.perf_counter() - start
@@ -1,104 +1,173 @@
 import os
-import re
-import requests
-from io import BytesIO
-from bs4 import BeautifulSoup
-from docx import Document
-from docx.shared import Inches
-from docx.oxml import parse_xml
-from docx.oxml.ns import nsdecls
+import time
+import uuid
+from functools import partial
 import streamlit as st
-from agno.models.groq import Groq
+from job_queue import QueuedNotes, default_job_queue, start_workers
+from metrics import metrics
+from notes_formats import FORMATS, available_formats
+from notes_jobs import MEMORY_BUDGET_MB, notes_file_name, parse_syllabus
+# Heavier modules (bs4, python-docx, requests, agno, numpy) are imported where a tab or
+# button first needs them, so reruns and the first page load don't pay for them
 
 import os
 from dotenv import load_dotenv
 load_dotenv()
 groq_api_key = os.getenv("GROQ_API_KEY")
 
-# ----- Syllabus Notes Utilities -----
-
-# Preprocessing text (removes extra spaces, unwanted phrases, etc.)
-def preprocess_gfg_content(raw_content):
-    cleaned_content = re.sub(r'\n+', '\n', raw_content)  # Collapse multiple newlines
-    cleaned_content = cleaned_content.strip()  # Strip leading and trailing whitespace
-    to_remove = [
-        r'\bSummarize\b', r'\bComments\b', r'\bImprove\b', r'\bLike Article\b', r'\bSave\b',
-        r'\bShare\b', r'\bReport\b', r'\bFollow\b', r'Last Updated\s*:\s*\d{1,2} \w+, \d{4}'
-    ]
-    for phrase in to_remove:
-        cleaned_content = re.sub(phrase, '', cleaned_content, flags=re.IGNORECASE)
-    cleaned_content = re.sub(r'\s{2,}', ' ', cleaned_content)
-    return cleaned_content
-
-# Use GeeksforGeeks internal API to search for an article URL
-def search_gfg_with_google(query):
-    search_url = f"https://recommendations.geeksforgeeks.org/api/v1/global-search?products=articles&query={query.replace(' ', '+')}&articles_count=1"
-    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-    response = requests.get(search_url, headers=headers)
-    data = response.json()
-    try:
-        return data['detail']['articles']['data'][0]['post_url']
-    except (KeyError, IndexError):
-        return None
-
-# Fetch article HTML from a given URL and remove unwanted elements
-def fetch_gfg_article_html(url):
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
-    article = soup.find('article', {'class': 'content'})
-    if not article:
-        return None
-    for element in article.find_all(['script', 'style', 'nav', 'footer', 'aside', 'form']):
-        element.decompose()
-    return str(article)
-
-
-def convert_html_to_docx_bytes(html_content):
+# ----- Streamlit Interface -----
+
+def user_id():
+    """This browser session's id, so the job queue can share workers fairly between users."""
+    if "user_id" not in st.session_state:
+        st.session_state.user_id = uuid.uuid4().hex[:12]
+    return st.session_state.user_id
+
+def submit_notes(syllabus, combined, fmt, memory_budget_mb, reuse=True):
+    """Queue a notes job (or join the identical one) and keep its id in the URL, so reloads and shared links find it."""
+    params = {"syllabus": syllabus, "combined": combined, "fmt": fmt, "memory_budget_mb": memory_budget_mb}
+    job_id = default_job_queue().submit("notes", params, user_id(), reuse=reuse)
+    st.session_state.notes_job = QueuedNotes(job_id)
+    st.query_params["notes_job"] = str(job_id)
+
+def submit_agent_jobs(slot, api_key, requests):
     """
-    Convert HTML content to a DOCX file in memory (BytesIO object).
-    Processes headings, paragraphs, lists, images, and <pre> code blocks.
+    Queue agent requests; show_agent_jobs(slot, ...) shows their answers.
+    Args:
+        slot (str): Where the page shows them (one tab, or the compare tab).
+        requests (dict): Label -> (agent name, keyword inputs of its agent_tasks stream function).
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    doc = Document()
-
-    for element in soup.find_all(['h1', 'h2', 'h3', 'p', 'ul', 'ol', 'img', 'pre']):
-        if element.name in ['h1', 'h2', 'h3']:
-            level = int(element.name[1])
-            doc.add_heading(element.get_text().strip(), level=level)
-        elif element.name == 'p':
-            doc.add_paragraph(element.get_text().strip())
-        elif element.name in ['ul', 'ol']:
-            for li in element.find_all('li'):
-                style = 'List Bullet' if element.name == 'ul' else 'List Number'
-                doc.add_paragraph(li.get_text().strip(), style=style)
-        elif element.name == 'img':
-            img_url = element.get('src')
-            if img_url  and img_url.split(".")[-1] in ["png","jpg","jpeg"]:
-                img_response = requests.get(img_url)
-                img_bytes = BytesIO(img_response.content)
-                doc.add_picture(img_bytes, width=Inches(4.5))
-                doc.add_paragraph("\n")
-        elif element.name == 'pre':
-            # Add code block with Lucida Console font and a light gray background.
-            code_text = element.get_text().strip()
-            para = doc.add_paragraph(code_text)
-            if para.runs:
-                run = para.runs[0]
-                run.font.name = "Lucida Console"
-            shading_elm = parse_xml(r'<w:shd {} w:fill="EAEAEA"/>'.format(nsdecls('w')))
-            para._element.get_or_add_pPr().append(shading_elm)
-
-    # Save the DOCX document to a BytesIO stream.
-    output = BytesIO()
-    doc.save(output)
-    output.seek(0)
-    return output
+    queue = default_job_queue()
+    similar = st.session_state.get("similar_answers", False)
+    # Repeated questions are answered from the LLM cache; only identical in-flight requests are joined
+    st.session_state.setdefault("agent_jobs", {})[slot] = {
+        label: queue.submit("agent", {"agent": agent, "inputs": inputs, "similar": similar}, user_id(),
+                            secret=api_key, reuse=False)
+        for label, (agent, inputs) in requests.items()
+    }
 
+def show_agent_answer(label, job):
+    state = job["state"]
+    if job["status"] == "queued":
+        st.info(f"Waiting for a worker ({default_job_queue().position(job['id'])} jobs ahead)")
+    elif job["status"] == "running":
+        st.markdown(state.get("text") or "Running...")
+    elif job["status"] == "failed":
+        st.error(f"{label} failed: {job['error']}")
+    elif not state.get("text"):
+        st.error(f"No response from the {label} agent.")
+    else:
+        timings = state["timings"]
+        st.markdown(state["text"])
+        source = "cache" if timings.get("cached") else "model"
+        if "ttft" in timings:
+            st.caption(f"First token after {timings['ttft']:.2f} s, complete after {timings['total']:.2f} s ({source})")
+        if timings.get("chunks"):
+            st.caption(f"{timings['chunks']} chunks summarized in {timings['map']:.2f} s")
+        recorded = st.session_state.setdefault("recorded_jobs", set())
+        if job["id"] not in recorded:
+            recorded.add(job["id"])
+            st.session_state.setdefault("agent_timings", []).append({"agent": label, **timings})
 
-# ----- Streamlit Interface -----
+def show_agent_jobs(slot, heading):
+    """Show the answers of the agent jobs queued for `slot` side by side, polling until all are done."""
+    jobs = st.session_state.get("agent_jobs", {}).get(slot)
+    if not jobs:
+        return
+    queue = default_job_queue()
+    polling = any(job is not None and not job["finished"] for job in map(queue.get, jobs.values()))
+
+    @st.fragment(run_every=1 if polling else None)
+    def show():
+        current = {label: queue.get(job_id) for label, job_id in jobs.items()}
+        columns = st.columns(len(current)) if len(current) > 1 else [st.container()]
+        for (label, job), column in zip(current.items(), columns):
+            with column:
+                st.markdown(heading.format(label=label))
+                if job is None:
+                    st.warning("This answer is no longer available; run the agent again.")
+                else:
+                    show_agent_answer(label, job)
+        done = [job for job in current.values() if job is not None and job["finished"]]
+        if len(done) < len(current):
+            return
+        if len(done) > 1:
+            took = sum(job["state"].get("timings", {}).get("total", 0) for job in done)
+            elapsed = max(job["finished_at"] for job in done) - min(job["submitted_at"] for job in done)
+            st.caption(f"All done in {elapsed:.2f} s (the runs took {took:.2f} s added up)")
+        if polling:
+            # Everything finished while polling; rerun once so the polling stops
+            st.rerun()
+
+    show()
+
+def show_article_choices(job):
+    """Let the user swap a topic's article for another search hit and regenerate (no new searches)."""
+    from gfg import normalize_topic
+    from search_index import default_search_index, rank_candidates
+
+    index = default_search_index()
+    chosen, top = {}, {}
+    with st.expander("Wrong article? Pick another search result"):
+        for unit, topics in job.syllabus.items():
+            context = " ".join([unit, *topics])
+            for topic in topics:
+                query = normalize_topic(topic)
+                candidates = index.candidates(query)
+                if not candidates or query in chosen:
+                    continue
+                ranked = rank_candidates(query, candidates, context)
+                titles = {candidate["url"]: candidate["title"] or candidate["url"] for candidate in ranked}
+                urls = list(titles)
+                current = index.best(query, context)
+                top[query] = urls[0]
+                chosen[query] = st.selectbox(
+                    f"{topic} ({unit})", urls,
+                    index=urls.index(current) if current in urls else 0,
+                    format_func=lambda url, titles=titles: f"{titles[url]} — {url}",
+                    key=f"article_{query}",
+                )
+        if chosen and st.button("Regenerate with these articles", key="regenerate_notes"):
+            for query, url in chosen.items():
+                # Picking the best ranked hit again just removes the override
+                index.set_override(query, None if url == top[query] else url)
+            # A new job, not the finished one with the old articles
+            submit_notes(job.syllabus, job.combined, job.fmt, job.memory_budget_mb, reuse=False)
+            st.rerun()
+
+def show_metrics_panel():
+    """Sidebar debug panel: where time went in this process and in the queue workers, plus exports."""
+    # Fetching, rendering and agent calls run in the workers; they publish their metrics to the queue
+    snapshot = [{**item, "labels": {**item["labels"], "process": "app"}} for item in metrics.snapshot()]
+    snapshot += default_job_queue().worker_metrics()
+    with st.sidebar.expander("Performance metrics", expanded=True):
+        def series_name(item):
+            labels = ", ".join(f"{key}={value}" for key, value in item["labels"].items())
+            return f"{item['name']} ({labels})" if labels else item["name"]
+
+        timers = [item for item in snapshot if item["type"] == "timer"]
+        if timers:
+            st.dataframe([
+                {"span": series_name(item), "calls": item["count"], "total s": round(item["sum"], 3),
+                 "avg ms": round(item["sum"] * 1000 / item["count"], 1), "max ms": round(item["max"] * 1000, 1)}
+                for item in timers
+            ], hide_index=True)
+        values = [item for item in snapshot if item["type"] != "timer"]
+        if values:
+            st.dataframe([{"metric": series_name(item), "value": item["value"]} for item in values], hide_index=True)
+        st.download_button("Prometheus text", metrics.to_prometheus(snapshot), file_name="study_notes.prom",
+                           mime="text/plain", key="metrics_prometheus")
+        st.download_button("JSON lines", metrics.to_jsonl(snapshot), file_name="study_notes_metrics.jsonl",
+                           mime="application/jsonl", key="metrics_jsonl")
+        if st.button("Reset metrics", key="metrics_reset"):
+            metrics.reset()
+            default_job_queue().reset_worker_metrics()
+            st.rerun()
 
 # Configure the Streamlit page
 st.set_page_config(page_title="Study Notes & Agents", layout="wide")
+# Notes and agent answers are built by worker processes shared by every session (once per app process)
+start_workers()
 
 # Use Streamlit tabs (or radio buttons) to switch between two functions:
 tab1, tab2 = st.tabs(["Syllabus Notes Generator", "Study Agents"])
@@ -106,7 +175,7 @@ tab1, tab2 = st.tabs(["Syllabus Notes Generator", "Study Agents"])
 # ------- Tab 1: Syllabus Notes Generator -------
 with tab1:
     st.header("Syllabus Notes Generator")
-    st.write("Add units and topics. The app will fetch content from GeeksforGeeks and create a DOCX file with the notes.")
+    st.write("Add units and topics. The app will fetch content from GeeksforGeeks and create DOCX, Markdown, HTML or PDF notes.")
     
     # Input: Allow user to add multiple units and topics (comma separated topics per unit)
     units_input = st.text_area(
@@ -114,52 +183,116 @@ with tab1:
         "Unit – 1: AVL Tree, Binary Search Tree"
     )
     
+    output_format = st.radio(
+        "Output",
+        ["One document per unit", "One combined document", "ZIP of all units"],
+        horizontal=True,
+    )
+    # Changing the format of finished notes re-renders them from their parsed blocks, no refetching
+    file_format = st.selectbox(
+        "File format", available_formats(), format_func=lambda fmt: FORMATS[fmt][0], key="notes_format",
+    )
+    format_label, extension, mime = FORMATS[file_format]
+    # Large syllabi: spill images, parsed articles and documents to disk to stay within the budget
+    memory_budget = st.number_input(
+        "Memory budget for the notes in MB (0 = no limit)", min_value=0, value=MEMORY_BUDGET_MB, step=256,
+        key="memory_budget",
+    )
+
     if st.button("Generate Syllabus Notes"):
         # Process each line as a unit
-        syllabus = {}
-        for line in units_input.splitlines():
-            if ":" in line:
-                unit, topics = line.split(":", 1)
-                syllabus[unit.strip()] = topics.strip()
+        syllabus = parse_syllabus(units_input)
         if not syllabus:
             st.error("Please enter valid units and topics.")
         else:
-            
-            # Build combined HTML for each unit
-            combined_docx = BytesIO()  # We'll combine the DOCX files in memory if needed.
-            for unit, topics in syllabus.items():
-                combined_html = f"<h1>{unit}</h1>"
-                topics_list = [t.strip() for t in topics.split(",")]
-                for topic in topics_list:
-                    st.write(f"Searching for topic: **{topic}**...")
-                    gfg_url = search_gfg_with_google(topic)
-                    if not gfg_url:
-                        combined_html += f"<h2>{topic}</h2><p>No content found.</p>"
-                    else:
-                        st.write(f"Found URL: {gfg_url}")
-                        article_html = fetch_gfg_article_html(gfg_url)
-                        if article_html:
-                            # Optionally preprocess article content here
-                            cleaned_html = preprocess_gfg_content(article_html)
-                            combined_html += f"<h2>{topic}</h2>{cleaned_html}"
-                        else:
-                            combined_html += f"<h2>{topic}</h2><p>No content found in article.</p>"
-                
-
-                # Convert the combined HTML to a DOCX file in memory.
-                docx_bytes = convert_html_to_docx_bytes(combined_html)
-                
-                
-                
-                if(docx_bytes):
-                    st.success("Notes created successfully")
-                # Offer a download button for this unit.
-                st.download_button(
-                    label=f"Download {unit} DOCX",
-                    data=docx_bytes,
-                    file_name=f"{unit.replace(' ', '_')}.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                )
+            # Queue the job for the workers; an identical job already queued, running or
+            # finished today (by anyone) is joined instead of run again
+            combined = output_format == "One combined document"
+            submit_notes(syllabus, combined, file_format, memory_budget)
+
+    # After a reload, or from a shared link, pick the job up from the URL
+    if "notes_job" not in st.session_state and "notes_job" in st.query_params:
+        try:
+            st.session_state.notes_job = QueuedNotes(int(st.query_params["notes_job"]))
+        except (KeyError, ValueError):
+            del st.query_params["notes_job"]
+
+    notes_job = st.session_state.get("notes_job")
+    polling = notes_job is not None and not notes_job.refresh().finished
+
+    # Poll the running job once a second without rerunning the whole page
+    @st.fragment(run_every=1 if polling else None)
+    def show_notes_job():
+        job = st.session_state.notes_job.refresh()
+        if job.finished:
+            st.progress(1.0, text="Done")
+        else:
+            st.progress(job.progress, text=f"Fetched {job.done_topics}/{job.total_topics} topics, "
+                                           f"built {len(job.documents)}/{len(job.syllabus)} units")
+        with st.expander("Details", expanded=not job.finished):
+            for line in list(job.log):
+                st.write(line)
+
+        def download_data(unit=None):
+            """Document bytes; deferred until clicked in low-memory mode, so the page holds no copy."""
+            if file_format == job.fmt:
+                data = partial(job.document, unit)
+            else:
+                data = partial(job.render, file_format, unit)
+            return data if job.memory_budget_mb else data()
+
+        # Offer a download button for each unit as soon as it is ready.
+        documents = dict(job.documents)
+        render_start = time.perf_counter()
+        for unit in job.syllabus:
+            if unit not in documents:
+                continue
+            report = job.image_reports[unit]
+            saved = report.get("original_bytes", 0) - report.get("optimized_bytes", 0)
+            st.success(f"Notes for {unit} created successfully")
+            st.caption(f"Image optimization saved {saved / 1024:.0f} KB in {unit}")
+            st.download_button(
+                label=f"Download {unit} {format_label}",
+                data=download_data(unit),
+                file_name=notes_file_name(unit, extension),
+                mime=mime,
+                key=f"download_{unit}",
+            )
+
+        if job.combined_document is not None:
+            st.download_button(
+                label=f"Download all units as one {format_label}",
+                data=download_data(),
+                file_name=f"Syllabus_Notes.{extension}",
+                mime=mime,
+                key="download_combined",
+            )
+        if job.finished and documents and output_format == "ZIP of all units":
+            st.download_button(
+                label="Download all units (ZIP)",
+                data=partial(job.zip_bytes, file_format) if job.memory_budget_mb else job.zip_bytes(file_format),
+                file_name="Syllabus_Notes.zip",
+                mime="application/zip",
+                key="download_zip",
+            )
+        if documents and file_format != job.fmt and not job.memory_budget_mb:
+            st.caption(f"Rendered as {format_label} from the parsed notes in "
+                       f"{(time.perf_counter() - render_start) * 1000:.0f} ms")
+
+        if job.error:
+            st.error(f"Generation failed: {job.error}")
+        if job.finished:
+            st.caption("These notes stay available for a day: reload the page or share its link to get them again.")
+            if job.peak_rss_mb is not None:
+                budget = f" (notes budget {job.memory_budget_mb} MB)" if job.memory_budget_mb else ""
+                st.caption(f"Peak memory of the worker process while it built them: {job.peak_rss_mb:.0f} MB{budget}")
+            if polling:
+                # The job finished while polling; rerun once so the polling stops
+                st.rerun()
+            show_article_choices(job)
+
+    if notes_job is not None:
+        show_notes_job()
             
 
 # ------- Tab 2: Study Agents -------
@@ -169,21 +302,21 @@ with tab2:
     st.sidebar.markdown(
         "[Get your Groq API Key from the Groq Console](https://console.groq.com/keys)"
     )
+    st.sidebar.checkbox(
+        "Reuse cached answers for similar questions",
+        key="similar_answers",
+        help="Needs fastembed or sentence-transformers. Exact repeats are always answered from the cache.",
+    )
     
     if groq_api_key:
         try:
-            from agno.agent import Agent
-            from agno.tools.youtube import YouTubeTools
-            from agno.tools.arxiv import ArxivTools
-            # from agno.tools.tavily import TavilyTools
-            from agno.tools.newspaper4k import Newspaper4kTools
-
             # Create tabs for each agent
-            tab_yt, tab_arxiv, tab_web, tab_flashcards = st.tabs([
+            tab_yt, tab_arxiv, tab_web, tab_flashcards, tab_compare = st.tabs([
                 "YouTube Summarizer", 
                 "Research Paper Summarizer", 
                 "Web Content Summarizer", 
-                "Flashcard Generator"
+                "Flashcard Generator",
+                "Run All / Compare"
             ])
 
             # YouTube Summarizer Tab
@@ -192,76 +325,53 @@ with tab2:
                 video_url = st.text_input("Enter YouTube video URL", "https://www.youtube.com/watch?v=Iv9dewmcFbs&t", key="youtube_url")
                 youtube_query = st.text_area("Enter your query for the video", "Summarize this video in 5 bullet points.", key="youtube_query")
                 if st.button("Run YouTube Agent", key="youtube_button"):
-                    with st.spinner("Processing YouTube video..."):
-                        youtube_agent = Agent(
-                            model=Groq(id="llama-3.3-70b-versatile", api_key=groq_api_key),
-                            tools=[YouTubeTools()],
-                            show_tool_calls=True,
-                            description="You are a YouTube agent. Obtain the captions of a YouTube video and answer questions.",
-                        )
-                        response = youtube_agent.run(f"{youtube_query} {video_url}", markdown=True)
-                        if response:
-                            st.markdown("### YouTube Video Summary:")
-                            st.markdown(response.content)
-                        else:
-                            st.error("No response from the YouTube agent.")
+                    submit_agent_jobs("youtube", groq_api_key,
+                                      {"YouTube": ("youtube", {"video_url": video_url, "query": youtube_query})})
+                show_agent_jobs("youtube", "### YouTube Video Summary:")
 
             # Research Paper Summarizer Tab
             with tab_arxiv:
                 st.subheader("Research Paper Summarizer")
                 arxiv_query = st.text_input("Enter Arxiv search query (e.g., 'machine learning')", "machine learning", key="arxiv_query")
                 if st.button("Run Arxiv Agent", key="arxiv_button"):
-                    with st.spinner("Fetching and summarizing research papers..."):
-                        arxiv_agent = Agent(
-                            model=Groq(id="llama-3.3-70b-versatile", api_key=groq_api_key),
-                            tools=[ArxivTools()],
-                            show_tool_calls=True,
-                            description="You are an Arxiv agent. Fetch and summarize research papers.",
-                        )
-                        response = arxiv_agent.run(f"Find and summarize the 5 latest papers on {arxiv_query}.", markdown=True)
-                        if response:
-                            st.markdown("### Research Paper Summaries:")
-                            st.markdown(response.content)
-                        else:
-                            st.error("No response from the Arxiv agent.")
+                    submit_agent_jobs("arxiv", groq_api_key, {"Arxiv": ("arxiv", {"search_query": arxiv_query})})
+                show_agent_jobs("arxiv", "### Research Paper Summaries:")
 
             # Web Content Summarizer Tab
             with tab_web:
                 st.subheader("Web Content Summarizer")
                 web_query = st.text_input("Enter web search query (e.g., 'latest advancements in AI')", "latest advancements in AI", key="web_query")
                 if st.button("Run Web Agent", key="web_button"):
-                    with st.spinner("Searching and summarizing web content..."):
-                        web_agent = Agent(
-                            model=Groq(id="llama-3.3-70b-versatile", api_key=groq_api_key),
-                            tools=[Newspaper4kTools()],
-                            show_tool_calls=True,
-                            description="You are a web agent. Search and summarize web content.",
-                        )
-                        response = web_agent.run(f"Search and summarize content about {web_query}.", markdown=True)
-                        if response:
-                            st.markdown("### Web Content Summary:")
-                            st.markdown(response.content)
-                        else:
-                            st.error("No response from the web agent.")
+                    submit_agent_jobs("web", groq_api_key, {"web": ("web", {"search_query": web_query})})
+                show_agent_jobs("web", "### Web Content Summary:")
 
             # Flashcard Generator Tab
             with tab_flashcards:
                 st.subheader("Flashcard Generator")
                 flashcard_topic = st.text_input("Enter a topic to generate flashcards", "machine learning", key="flashcard_topic")
                 if st.button("Generate Flashcards", key="flashcard_button"):
-                    with st.spinner("Generating flashcards..."):
-                        flashcard_agent = Agent(
-                            model=Groq(id="llama-3.3-70b-versatile", api_key=groq_api_key),
-                            tools=[],
-                            show_tool_calls=True,
-                            description="You are a flashcard generator. Create flashcards for the given topic.",
-                        )
-                        response = flashcard_agent.run(f"Generate 5 flashcards for the topic: {flashcard_topic}.", markdown=True)
-                        if response:
-                            st.markdown("### Flashcards:")
-                            st.markdown(response.content)
-                        else:
-                            st.error("No response from the flashcard agent.")
+                    # The worker answers from the syllabus notes already downloaded, when they cover the topic
+                    submit_agent_jobs("flashcards", groq_api_key,
+                                      {"flashcard": ("flashcards", {"topic": flashcard_topic})})
+                show_agent_jobs("flashcards", "### Flashcards:")
+
+            # Run several agents at once, using the inputs of the tabs above
+            with tab_compare:
+                st.subheader("Run All / Compare")
+                st.write("Runs the selected agents concurrently with the inputs from their tabs "
+                         "and shows each answer as soon as it is ready.")
+                selected = st.multiselect("Agents", ["YouTube", "Arxiv", "Web", "Flashcards"],
+                                          default=["YouTube", "Arxiv", "Web", "Flashcards"], key="compare_agents")
+                if st.button("Run selected agents", key="compare_button") and selected:
+                    state = st.session_state
+                    requests = {
+                        "YouTube": ("youtube", {"video_url": state.youtube_url, "query": state.youtube_query}),
+                        "Arxiv": ("arxiv", {"search_query": state.arxiv_query}),
+                        "Web": ("web", {"search_query": state.web_query}),
+                        "Flashcards": ("flashcards", {"topic": state.flashcard_topic}),
+                    }
+                    submit_agent_jobs("compare", groq_api_key, {label: requests[label] for label in selected})
+                show_agent_jobs("compare", "### {label}")
 
         except Exception as e:
             st.error(f"Error loading agents: {e}")
@@ -301,3 +411,7 @@ text-align: center;
 </div>
 """
 st.markdown(footer,unsafe_allow_html=True)
+
+# Debug panel last, so it includes the work done in this run
+if st.sidebar.checkbox("Show performance metrics", key="show_metrics"):
+    show_metrics_panel()
@@ -0,0 +1,184 @@
+"""
+Lightweight in-process instrumentation: timers, counters and gauges.
+
+Stages are timed with `span("name", label=value)` (a context manager) or the
+`timed("name")` decorator. Counters record things like bytes transferred or
+tokens used, and collectors report gauges such as cache hit rates when the
+metrics are exported. Everything lives in the process-wide `metrics`
+registry and can be exported as Prometheus text or JSON lines.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# resource is Unix only; peak RSS is not reported elsewhere
+try:
+    import resource
+except ImportError:
+    resource = None
+
+PREFIX = "study_notes_"
+# If set, the CLI tools write their metrics here on exit (.prom for Prometheus text, else JSON lines)
+METRICS_FILE = os.getenv("NOTES_METRICS_FILE")
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far in MB, or None where it cannot be measured."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def rss_mb():
+    """Current resident memory of this process in MB, or None where it cannot be read (Linux only)."""
+    try:
+        with open("/proc/self/statm") as file:
+            pages = int(file.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _prometheus_labels(labels):
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"') for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+class Metrics:
+    """Thread-safe registry of timers (count, sum, max), counters and gauge collectors."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timers = {}  # (name, labels) -> [count, total seconds, max seconds]
+        self._counters = {}  # (name, labels) -> value
+        self._collectors = []  # (callable returning {name: value}, labels)
+
+    def observe(self, name, seconds, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            timer = self._timers.setdefault(key, [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+
+    def incr(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Time the enclosed block as `name` (errors are timed too)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name, **labels):
+        """Decorator form of span()."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def add_collector(self, collect, **labels):
+        """Register a callable returning {gauge name: value}, read at export time."""
+        with self._lock:
+            self._collectors.append((collect, tuple(sorted((k, str(v)) for k, v in labels.items()))))
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """
+        Return every series as a list of dicts with "type" (timer, counter or gauge),
+        "name" and "labels", plus "count"/"sum"/"max" for timers or "value" otherwise.
+        """
+        with self._lock:
+            timers = [(key, list(value)) for key, value in self._timers.items()]
+            counters = list(self._counters.items())
+            collectors = list(self._collectors)
+        series = [
+            {"type": "timer", "name": name, "labels": dict(labels), "count": count, "sum": total, "max": longest}
+            for (name, labels), (count, total, longest) in sorted(timers)
+        ]
+        series += [
+            {"type": "counter", "name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(counters)
+        ]
+        for collect, labels in collectors:
+            try:
+                gauges = collect()
+            except Exception:
+                continue  # a broken collector must not break the export
+            series += [
+                {"type": "gauge", "name": name, "labels": dict(labels), "value": value}
+                for name, value in sorted(gauges.items())
+            ]
+        return series
+
+    def to_prometheus(self, series=None):
+        """
+        Prometheus text exposition format: timers become a summary (count and sum,
+        in seconds) plus a *_seconds_max gauge, counters are named *_total.
+        `series` (a snapshot, e.g. merged from several processes) defaults to this registry's.
+        """
+        families = {}  # metric name -> (type, sample lines), samples grouped per family
+
+        def add(name, kind, line):
+            families.setdefault(name, (kind, []))[1].append(line)
+
+        for item in self.snapshot() if series is None else series:
+            labels = _prometheus_labels(tuple(item["labels"].items()))
+            if item["type"] == "timer":
+                name = f"{PREFIX}{item['name']}_seconds"
+                add(name, "summary", f"{name}_count{labels} {item['count']}")
+                add(name, "summary", f"{name}_sum{labels} {item['sum']:.6f}")
+                add(f"{name}_max", "gauge", f"{name}_max{labels} {item['max']:.6f}")
+            else:
+                name = f"{PREFIX}{item['name']}{'_total' if item['type'] == 'counter' else ''}"
+                add(name, item["type"], f"{name}{labels} {item['value']}")
+        lines = []
+        for name, (kind, samples) in families.items():
+            lines.append(f"# TYPE {name} {kind}")
+            lines += samples
+        return "\n".join(lines) + "\n"
+
+    def to_jsonl(self, series=None):
+        """One JSON object per series, stamped with the export time."""
+        now = time.time()
+        series = self.snapshot() if series is None else series
+        return "".join(json.dumps({"ts": now, **item}) + "\n" for item in series)
+
+    def export(self, path):
+        """Write the metrics to `path`: Prometheus text for *.prom (replaced), else appended JSON lines."""
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_jsonl()
+        mode = "w" if path.endswith(".prom") else "a"
+        with open(path, mode, encoding="utf-8") as file:
+            file.write(text)
+
+
+metrics = Metrics()
+if resource is not None:
+    metrics.add_collector(lambda: {"peak_rss_bytes": int(peak_rss_mb() * 1024 * 1024)})
+span = metrics.span
+timed = metrics.timed
+incr = metrics.incr
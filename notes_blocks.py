@@ -0,0 +1,254 @@
+"""
+Articles as compact, serializable block lists.
+
+An article is parsed once into a flat list of blocks, each a short list:
+
+    ["h", level, text]          heading (level 1-3)
+    ["p", text]                 paragraph
+    ["li", kind, level, text]   list item, kind "ul" or "ol", level 1-3
+    ["code", text]              <pre> block
+    ["img", url]                image reference (downloaded when rendered)
+
+Block lists are what the renderers in notes_formats turn into DOCX, Markdown,
+HTML or PDF, so switching format never goes back to the network or the HTML
+parser. Parsed articles are cached on disk by the hash of their HTML,
+msgpack-encoded when msgpack is installed and as JSON otherwise.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from importlib.util import find_spec
+
+from metrics import incr, span
+from notes_cache import CACHE_DIR
+
+# msgpack is optional: smaller and faster to decode than JSON, same data
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# lxml parses several times faster than the pure-Python parser; use it when installed
+HTML_PARSER = "lxml" if find_spec("lxml") else "html.parser"
+
+HEADING_LEVELS = {"h1": 1, "h2": 2, "h3": 3}
+SKIPPED_TAGS = {"script", "style", "noscript", "template"}
+MAX_LIST_LEVEL = 3
+# Bump when the block format or the parsing rules change, so old cache entries are ignored
+BLOCKS_VERSION = 2
+# Fragments shorter than this (unit and topic headings) are parsed directly, not cached
+MIN_CACHED_CHARS = 1024
+MAX_ENTRIES = 20000  # cached articles kept before the least recently used are dropped
+
+
+# ----- HTML -> blocks -----
+
+def html_to_blocks(html):
+    """
+    Parse one HTML fragment into a block list.
+    Walks the DOM exactly once, emitting headings, paragraphs, list items,
+    images and <pre> code blocks as they are reached.
+    """
+    from bs4 import BeautifulSoup
+
+    with span("blocks_parse"):
+        soup = BeautifulSoup(html, HTML_PARSER)
+        blocks = []
+        _walk(soup, blocks)
+        soup.decompose()
+    return blocks
+
+
+def _walk(node, blocks):
+    from bs4 import Tag
+
+    for child in node.children:
+        if not isinstance(child, Tag) or child.name in SKIPPED_TAGS:
+            continue
+        if child.name in HEADING_LEVELS:
+            _add_text(blocks, child.get_text(), HEADING_LEVELS[child.name])
+        elif child.name == "p":
+            _add_text(blocks, child.get_text())
+            _add_nested_images(blocks, child)
+        elif child.name in ("ul", "ol"):
+            _add_list(blocks, child, 1)
+        elif child.name == "img":
+            blocks.append(["img", child.get("src")])
+        elif child.name == "pre":
+            text = child.get_text().strip()
+            if text:
+                blocks.append(["code", text])
+        else:
+            # Containers (div, section, table, ...) are only walked through
+            _walk(child, blocks)
+
+
+def _add_text(blocks, text, level=None):
+    text = text.strip()
+    if not text:
+        return
+    blocks.append(["h", level, text] if level else ["p", text])
+
+
+def _add_list(blocks, element, level):
+    from bs4 import Comment, Tag
+
+    for li in element.find_all("li", recursive=False):
+        # The item's own text, without the text of lists nested inside it
+        parts, nested = [], []
+        for child in li.children:
+            if isinstance(child, Comment):
+                continue
+            if isinstance(child, Tag) and child.name in ("ul", "ol"):
+                nested.append(child)
+            elif isinstance(child, Tag):
+                parts.append(child.get_text())
+            else:
+                parts.append(str(child))
+        text = "".join(parts).strip()
+        if text:
+            blocks.append(["li", element.name, level, text])
+        _add_nested_images(blocks, li)
+        for sub_list in nested:
+            _add_list(blocks, sub_list, min(level + 1, MAX_LIST_LEVEL))
+
+
+def _add_nested_images(blocks, element):
+    for img in element.find_all("img"):
+        # Images of a nested list item are added with that item
+        if element.name == "li" and img.find_parent("li") is not element:
+            continue
+        blocks.append(["img", img.get("src")])
+
+
+def image_urls(blocks):
+    """Image URLs referenced by a block list, once each, in document order."""
+    return list(dict.fromkeys(block[1] for block in blocks if block[0] == "img" and block[1]))
+
+
+def blocks_digest(blocks):
+    """Stable hash of a block list, to spot the same article rendered twice."""
+    return hashlib.sha256(json.dumps(blocks, separators=(",", ":")).encode("utf-8")).digest()
+
+
+# ----- Serialization -----
+
+def pack_blocks(blocks):
+    """Encode a block list as compressed msgpack (or JSON). Returns (codec, bytes)."""
+    if msgpack is not None:
+        return "msgpack", zlib.compress(msgpack.packb(blocks))
+    return "json", zlib.compress(json.dumps(blocks, separators=(",", ":")).encode("utf-8"))
+
+
+def unpack_blocks(codec, data):
+    """Decode what pack_blocks produced, or return None if the codec is unavailable."""
+    if codec == "msgpack":
+        return msgpack.unpackb(zlib.decompress(data)) if msgpack is not None else None
+    return json.loads(zlib.decompress(data))
+
+
+# ----- Cache -----
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    key TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blocks_accessed ON blocks (accessed_at);
+"""
+
+
+class BlockCache:
+    """
+    SQLite store of parsed articles, keyed by the hash of their HTML.
+
+    The least recently used entries are dropped once more than `max_entries`
+    are stored.
+    """
+
+    def __init__(self, path=None, max_entries=MAX_ENTRIES):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "blocks.sqlite3")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    @staticmethod
+    def make_key(html):
+        return hashlib.sha256(f"{BLOCKS_VERSION}:{html}".encode("utf-8")).hexdigest()
+
+    def blocks(self, html):
+        """
+        Return the block list for an HTML fragment, parsing it only if it is not cached.
+        Args:
+            html (str): One article or heading fragment.
+        Returns:
+            list: The fragment's blocks.
+        """
+        if len(html) < MIN_CACHED_CHARS:
+            return html_to_blocks(html)
+        key = self.make_key(html)
+        with self._lock:
+            row = self._db.execute("SELECT codec, data FROM blocks WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._db.execute("UPDATE blocks SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+        blocks = unpack_blocks(*row) if row else None
+        if blocks is not None:
+            self.hits += 1
+            incr("blocks_cache_hits")
+            return blocks
+        self.misses += 1
+        incr("blocks_cache_misses")
+        blocks = html_to_blocks(html)
+        codec, data = pack_blocks(blocks)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?)", (key, codec, data, time.time()))
+            self._evict()
+            self._db.commit()
+        return blocks
+
+    def _evict(self):
+        (count,) = self._db.execute("SELECT COUNT(*) FROM blocks").fetchone()
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM blocks WHERE key IN (SELECT key FROM blocks ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_block_cache():
+    """Return the process-wide BlockCache, creating it on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = BlockCache()
+        return _default
+
+
+def fragments_to_sections(fragments, cache=None):
+    """
+    Parse HTML fragments (through the block cache) into sections, one block list per fragment.
+    Args:
+        fragments (str | list): One HTML string, or a list of per-topic fragments.
+        cache (BlockCache): Defaults to the process-wide cache.
+    """
+    if isinstance(fragments, str):
+        fragments = [fragments]
+    cache = cache or default_block_cache()
+    return [cache.blocks(html) for html in fragments]
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlencode
+
+# Where cached responses live and how long they stay fresh
+CACHE_DIR = os.getenv("NOTES_CACHE_DIR", ".notes_cache")
+DEFAULT_TTL = 7 * 24 * 3600  # one week
+MAX_BYTES = 512 * 1024 * 1024  # total compressed body size before LRU eviction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+"""
+
+
+class HttpCache:
+    """
+    SQLite-backed cache for GET responses.
+
+    Bodies are stored zlib-compressed and addressed by the SHA-256 of their
+    content, so the same image served under two URLs is stored once. Entries
+    older than `ttl` are revalidated with If-None-Match / If-Modified-Since,
+    and the least recently used entries are evicted once the stored bodies
+    exceed `max_bytes`.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_bytes=MAX_BYTES):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "http.sqlite3")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    @staticmethod
+    def make_key(url, params=None):
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return url, hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, url, fetch, params=None, headers=None):
+        """
+        Return the body for a GET request, going to the network only when needed.
+        Args:
+            url (str): Request URL.
+            fetch (callable): Function with the `requests.get` signature used on a miss.
+            params (dict): Query parameters, part of the cache key.
+            headers (dict): Request headers (not part of the cache key).
+        Returns:
+            bytes: Response body, or None if the server did not answer 200.
+        """
+        full_url, key = self.make_key(url, params)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT r.digest, r.etag, r.last_modified, r.fetched_at, b.data "
+                "FROM responses r JOIN blobs b ON b.digest = r.digest WHERE r.key = ?",
+                (key,),
+            ).fetchone()
+            if row and now - row[3] < self.ttl:
+                self.hits += 1
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                self._db.commit()
+                return zlib.decompress(row[4])
+
+        headers = dict(headers or {})
+        if row:
+            if row[1]:
+                headers["If-None-Match"] = row[1]
+            if row[2]:
+                headers["If-Modified-Since"] = row[2]
+        response = fetch(url, params=params, headers=headers)
+
+        with self._lock:
+            if row and response.status_code == 304:
+                self.revalidated += 1
+                self._db.execute(
+                    "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                    (now, now, key),
+                )
+                self._db.commit()
+                return zlib.decompress(row[4])
+            self.misses += 1
+            if response.status_code != 200:
+                return None
+            body = response.content
+            self._store(key, full_url, body, response.headers, now)
+            return body
+
+    def _store(self, key, url, body, headers, now):
+        digest = hashlib.sha256(body).hexdigest()
+        data = zlib.compress(body)
+        self._db.execute(
+            "INSERT OR IGNORE INTO blobs (digest, data, size) VALUES (?, ?, ?)",
+            (digest, data, len(data)),
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, url, digest, headers.get("ETag"), headers.get("Last-Modified"), now, now),
+        )
+        self._evict()
+        self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        while total > self.max_bytes:
+            oldest = self._db.execute(
+                "SELECT key FROM responses ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if not oldest:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", oldest)
+            self.evictions += 1
+            # Drop bodies no longer referenced by any response
+            freed = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM blobs "
+                "WHERE digest NOT IN (SELECT digest FROM responses)"
+            ).fetchone()[0]
+            self._db.execute("DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM responses)")
+            total -= freed
+
+    def stats(self):
+        """Hit/miss counters and the current on-disk size."""
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT (SELECT COUNT(*) FROM responses), COALESCE(SUM(size), 0) FROM blobs"
+            ).fetchone()
+        lookups = self.hits + self.misses + self.revalidated
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.revalidated) / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
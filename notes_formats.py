@@ -0,0 +1,250 @@
+"""
+Renderers from block lists (see notes_blocks) to DOCX, Markdown, HTML and PDF.
+
+Every renderer takes `sections`, a list of block lists (one per article or
+heading fragment), in document order. Markdown and HTML link images by URL;
+DOCX and PDF embed them, using bytes passed in as `images` and downloading
+the rest.
+"""
+import html as html_lib
+import re
+from importlib.util import find_spec
+from io import BytesIO
+
+from metrics import span
+
+# PDF output needs reportlab, which is optional
+PDF_AVAILABLE = find_spec("reportlab") is not None
+
+# Format key -> (label, file extension, MIME type)
+FORMATS = {
+    "docx": ("DOCX", "docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "md": ("Markdown", "md", "text/markdown"),
+    "html": ("HTML", "html", "text/html"),
+    "pdf": ("PDF", "pdf", "application/pdf"),
+}
+# Formats that embed images (and so need them downloaded first)
+IMAGE_FORMATS = {"docx", "pdf"}
+IMAGE_WIDTH_INCHES = 4.5
+
+
+def available_formats():
+    """Format keys that can be rendered with the installed packages."""
+    return [fmt for fmt in FORMATS if fmt != "pdf" or PDF_AVAILABLE]
+
+
+def _blocks(sections):
+    for blocks in sections:
+        yield from blocks
+
+
+# ----- Markdown -----
+
+# Article text is literal: escape what Markdown would read as markup
+MD_INLINE = re.compile(r"([\\`*_\[\]<>#])")
+MD_LINE_START = re.compile(r"^([ \t]*)([+=-])", re.M)
+MD_NUMBERED = re.compile(r"^([ \t]*\d+)([.)])", re.M)
+
+
+def _md_escape(text):
+    text = MD_INLINE.sub(r"\\\1", text)
+    text = MD_LINE_START.sub(r"\1\\\2", text)
+    return MD_NUMBERED.sub(r"\1\\\2", text)
+
+
+def _md_fence(code):
+    # A fence longer than any backtick run inside the code
+    longest = max((len(run) for run in re.findall(r"`+", code)), default=0)
+    return "`" * max(3, longest + 1)
+
+
+def render_markdown(sections):
+    lines, previous = [], None
+    for block in _blocks(sections):
+        kind = block[0]
+        # List items of one list follow each other; everything else is separated by a blank line
+        if lines and not (kind == "li" and previous == "li"):
+            lines.append("")
+        if kind == "h":
+            lines.append(f"{'#' * block[1]} {_md_escape(block[2])}")
+        elif kind == "p":
+            lines.append(_md_escape(block[1]))
+        elif kind == "li":
+            _, list_kind, level, text = block
+            marker = "-" if list_kind == "ul" else "1."
+            lines.append(f"{'    ' * (level - 1)}{marker} {_md_escape(text)}")
+        elif kind == "code":
+            fence = _md_fence(block[1])
+            lines += [fence, block[1], fence]
+        elif kind == "img" and block[1]:
+            lines.append(f"![]({block[1]})")
+        previous = kind
+    return "\n".join(lines) + "\n"
+
+
+# ----- HTML -----
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; max-width: 50em; margin: 2em auto; line-height: 1.5; }}
+pre {{ background: #eaeaea; padding: 0.75em; overflow-x: auto; font-family: "Lucida Console", monospace; }}
+img {{ max-width: {width}in; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def render_html(sections, title="Notes"):
+    # Open lists from the outermost in, as [kind, whether its last <li> is still open];
+    # a nested list goes inside the open item of its parent list
+    parts, open_lists = [], []
+
+    def close_lists(level):
+        while len(open_lists) > level:
+            list_kind, item_open = open_lists.pop()
+            if item_open:
+                parts.append("</li>")
+            parts.append(f"</{list_kind}>")
+
+    for block in _blocks(sections):
+        kind = block[0]
+        if kind != "li":
+            close_lists(0)
+        if kind == "h":
+            parts.append(f"<h{block[1]}>{html_lib.escape(block[2])}</h{block[1]}>")
+        elif kind == "p":
+            parts.append(f"<p>{html_lib.escape(block[1])}</p>")
+        elif kind == "li":
+            _, list_kind, level, text = block
+            close_lists(level)
+            if len(open_lists) == level and open_lists[-1][0] != list_kind:
+                close_lists(level - 1)
+            while len(open_lists) < level:
+                if open_lists and not open_lists[-1][1]:
+                    parts.append("<li>")  # a list skipping a level still nests in an item
+                    open_lists[-1][1] = True
+                parts.append(f"<{list_kind}>")
+                open_lists.append([list_kind, False])
+            if open_lists[-1][1]:
+                parts.append("</li>")
+            parts.append(f"<li>{html_lib.escape(text)}")
+            open_lists[-1][1] = True
+        elif kind == "code":
+            parts.append(f"<pre><code>{html_lib.escape(block[1])}</code></pre>")
+        elif kind == "img" and block[1]:
+            parts.append(f'<img src="{html_lib.escape(block[1])}" alt="">')
+    close_lists(0)
+    return HTML_TEMPLATE.format(title=html_lib.escape(title), width=IMAGE_WIDTH_INCHES, body="\n".join(parts))
+
+
+# ----- PDF -----
+
+def render_pdf(sections, images=None, image_report=None, output=None):
+    """
+    Render sections to PDF with reportlab.
+    Args:
+        images (dict): URL -> downloaded image bytes or spilled file path; other
+            supported images are fetched here.
+        image_report (dict): If given, filled with the original and optimized image byte totals.
+        output (file): If given, the PDF is written here and returned instead of bytes.
+    """
+    if not PDF_AVAILABLE:
+        raise RuntimeError("PDF output needs reportlab (pip install reportlab)")
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.lib.utils import ImageReader
+    from reportlab.platypus import Image, Paragraph, Preformatted, SimpleDocTemplate, Spacer
+
+    from images import downloaded_image, is_supported_image, optimize_image
+
+    images = images if images is not None else {}
+    image_report = image_report if image_report is not None else {}
+    image_report.setdefault("original_bytes", 0)
+    image_report.setdefault("optimized_bytes", 0)
+    styles = getSampleStyleSheet()
+    list_styles = {
+        level: ParagraphStyle(f"List{level}", parent=styles["BodyText"], leftIndent=18 * level,
+                              bulletIndent=18 * level - 12)
+        for level in range(1, 4)
+    }
+    story, numbers = [], {}  # numbers: list level -> last number used in an ordered list
+
+    for block in _blocks(sections):
+        kind = block[0]
+        if kind != "li":
+            numbers.clear()
+        if kind == "h":
+            story.append(Paragraph(html_lib.escape(block[2]), styles[f"Heading{block[1]}"]))
+        elif kind == "p":
+            story.append(Paragraph(html_lib.escape(block[1]), styles["BodyText"]))
+        elif kind == "li":
+            _, list_kind, level, text = block
+            for deeper in [n for n in numbers if n > level]:
+                del numbers[deeper]
+            if list_kind == "ol":
+                numbers[level] = numbers.get(level, 0) + 1
+            bullet = f"{numbers[level]}." if list_kind == "ol" else "•"
+            story.append(Paragraph(html_lib.escape(text), list_styles[level], bulletText=bullet))
+        elif kind == "code":
+            story.append(Preformatted(block[1], styles["Code"]))
+        elif kind == "img" and is_supported_image(block[1]):
+            data = downloaded_image(images, block[1])
+            if not data:
+                continue
+            optimized = optimize_image(data, width_inches=IMAGE_WIDTH_INCHES)
+            image_report["original_bytes"] += len(data)
+            image_report["optimized_bytes"] += len(optimized)
+            width, height = ImageReader(BytesIO(optimized)).getSize()
+            story.append(Image(BytesIO(optimized), width=IMAGE_WIDTH_INCHES * inch,
+                               height=IMAGE_WIDTH_INCHES * inch * height / width))
+            story.append(Spacer(1, 6))
+
+    if output is not None:
+        SimpleDocTemplate(output).build(story)
+        return output
+    output = BytesIO()
+    SimpleDocTemplate(output).build(story)
+    return output.getvalue()
+
+
+# ----- Dispatch -----
+
+def render_sections_bytes(sections, fmt="docx", images=None, converted=None, title="Notes", output=None):
+    """
+    Process-pool worker: render sections in one format.
+    Args:
+        sections (list): Block lists in document order.
+        fmt (str): A key of FORMATS.
+        images (dict): URL -> downloaded image bytes or spilled file path, for DOCX and PDF.
+        converted (dict): DOCX elements of sections already rendered (see DocxBuilder).
+        title (str): Document title, for HTML.
+        output (file): If given, the document is written here instead of returned as bytes.
+    Returns:
+        tuple: (document bytes or `output`, image report).
+    """
+    image_report = {}
+    with span("render", format=fmt):
+        if fmt == "docx":
+            from html_to_docx import render_docx_bytes
+
+            return render_docx_bytes(sections, images, converted, output)
+        if fmt == "pdf":
+            return render_pdf(sections, images, image_report, output), image_report
+        if fmt == "md":
+            document = render_markdown(sections).encode("utf-8")
+        elif fmt == "html":
+            document = render_html(sections, title).encode("utf-8")
+        else:
+            raise ValueError(f"Unknown format: {fmt}")
+    if output is not None:
+        output.write(document)
+        return output, image_report
+    return document, image_report
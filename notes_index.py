@@ -0,0 +1,163 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from bs4 import BeautifulSoup
+
+from embeddings import EMBEDDING_MODEL, cosine, from_blob, get_embedder, to_blob
+from long_summaries import chunk_text
+from notes_blocks import HTML_PARSER
+from notes_cache import CACHE_DIR
+
+# numpy makes search a single matrix product; without it we fall back to pure Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_TOKENS = 256
+# Below this a passage is not considered relevant. bge-small cosine scores are compressed
+# into roughly [0.6, 1] (see the model card), so unrelated passages often pass 0.5-0.6
+MIN_SCORE = float(os.getenv("NOTES_MIN_SCORE", "0.7"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS topics (
+    topic_key TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    url TEXT,
+    content_hash TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    topic_key TEXT NOT NULL,
+    text TEXT NOT NULL,
+    embedding BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_topic ON chunks (topic_key);
+"""
+
+
+def topic_key(topic):
+    return " ".join(topic.lower().split())
+
+
+class NotesIndex:
+    """
+    On-disk vector index over the GfG articles used for syllabus notes.
+
+    Articles are reduced to text, split into ~256-token passages and embedded
+    with the local CPU embedder. A topic is only re-embedded when its text
+    (or the embedding model) changes. Searches run against an in-memory copy
+    of the vectors that is reloaded after writes.
+    """
+
+    def __init__(self, path=None, embedder=None):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "notes_index.sqlite3")
+        self._embedder = embedder
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._loaded = None  # (rows, matrix) cache for search
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+
+    @property
+    def available(self):
+        return self.embedder is not None
+
+    def add_article(self, topic, url, article_html):
+        """
+        Index one article, skipping it if its text has not changed since the last run.
+        Returns:
+            bool: True if the topic was (re-)embedded.
+        """
+        if not article_html or not self.available:
+            return False
+        text = BeautifulSoup(article_html, HTML_PARSER).get_text("\n", strip=True)
+        content_hash = hashlib.sha256(f"{EMBEDDING_MODEL}\n{text}".encode("utf-8")).hexdigest()
+        key = topic_key(topic)
+        with self._lock:
+            row = self._db.execute("SELECT content_hash FROM topics WHERE topic_key = ?", (key,)).fetchone()
+        if row and row[0] == content_hash:
+            return False
+
+        passages = chunk_text(text, max_tokens=CHUNK_TOKENS)
+        vectors = self.embedder(passages) if passages else []
+        with self._lock:
+            self._db.execute("DELETE FROM chunks WHERE topic_key = ?", (key,))
+            self._db.executemany(
+                "INSERT INTO chunks (topic_key, text, embedding) VALUES (?, ?, ?)",
+                [(key, passage, to_blob(vector)) for passage, vector in zip(passages, vectors)],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO topics VALUES (?, ?, ?, ?, ?)",
+                (key, topic, url, content_hash, time.time()),
+            )
+            self._db.commit()
+            self._loaded = None
+        return True
+
+    def add_unit(self, results):
+        """Index a unit's (topic, url, article_html) results. Returns the number of topics embedded."""
+        return sum(self.add_article(topic, url, html) for topic, url, html in results if html)
+
+    def _load(self):
+        if self._loaded is None:
+            rows = self._db.execute(
+                "SELECT t.topic, c.text, c.embedding FROM chunks c JOIN topics t ON t.topic_key = c.topic_key"
+            ).fetchall()
+            if np is not None and rows:
+                matrix = np.stack([np.frombuffer(blob, dtype=np.float32) for _, _, blob in rows])
+                matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+            else:
+                matrix = [from_blob(blob) for _, _, blob in rows]
+            self._loaded = ([(topic, text) for topic, text, _ in rows], matrix)
+        return self._loaded
+
+    def search(self, query, k=5, min_score=MIN_SCORE):
+        """
+        Find the passages most similar to a query.
+        Returns:
+            list: (score, topic, passage) tuples, best first.
+        """
+        if not self.available:
+            return []
+        vector = self.embedder([query])[0]
+        with self._lock:
+            rows, matrix = self._load()
+        if not rows:
+            return []
+        if np is not None:
+            query_vec = np.asarray(vector, dtype=np.float32)
+            scores = matrix @ (query_vec / (np.linalg.norm(query_vec) + 1e-12))
+            order = np.argsort(-scores)[:k]
+            ranked = [(float(scores[i]), *rows[i]) for i in order]
+        else:
+            ranked = sorted(
+                ((cosine(vector, vec), *row) for row, vec in zip(rows, matrix)),
+                key=lambda item: item[0], reverse=True,
+            )[:k]
+        return [item for item in ranked if item[0] >= min_score]
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_notes_index():
+    """Return the process-wide NotesIndex, creating it on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = NotesIndex()
+        return _default
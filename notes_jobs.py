@@ -0,0 +1,411 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+
+from metrics import metrics, peak_rss_mb, rss_mb, span
+
+# Fetching, parsing and DOCX modules (bs4, python-docx, requests, Pillow) are imported
+# where they are first used, so the app starts and this module imports without them
+
+# Processes rendering unit documents (python-docx is pure Python and CPU bound); 1 renders in-thread
+RENDER_PROCESSES = int(os.getenv("NOTES_RENDER_PROCESSES", os.cpu_count() or 1))
+# Memory budget of a notes job (its images, articles and documents) in MB; 0 keeps everything in memory
+MEMORY_BUDGET_MB = int(os.getenv("NOTES_MEMORY_BUDGET_MB", "0"))
+# Image downloads at once in low-memory mode; each holds one whole image until it is written out
+LOW_MEMORY_IMAGE_WORKERS = 4
+RSS_SAMPLE_SECONDS = 0.1  # how often a job samples the process's memory for its peak
+
+
+def parse_syllabus(text):
+    """
+    Parse the syllabus text area: one unit per line, "UnitName: topic1, topic2, ...".
+    Returns:
+        dict: Unit name -> list of topic names.
+    """
+    syllabus = {}
+    for line in text.splitlines():
+        if ":" in line:
+            unit, topics = line.split(":", 1)
+            topics = [t.strip() for t in topics.split(",") if t.strip()]
+            if topics:
+                syllabus[unit.strip()] = topics
+    return syllabus
+
+
+def build_unit_fragments(unit, results):
+    """
+    Turn a unit's fetched articles into the list of HTML fragments for its document.
+    Args:
+        unit (str): Unit name, used as the top-level heading.
+        results (list): (topic, url, article_html) tuples in syllabus order.
+    Articles are kept as fragments of their own, so a topic repeated across units
+    yields identical fragments that are parsed once and whose DOCX DocxBuilder can reuse.
+    """
+    fragments = [f"<h1>{unit}</h1>"]
+    for topic, gfg_url, article_html in results:
+        if not gfg_url:
+            fragments.append(f"<h2>{topic}</h2><p>No content found.</p>")
+        elif article_html:
+            fragments += [f"<h2>{topic}</h2>", article_html]
+        else:
+            fragments.append(f"<h2>{topic}</h2><p>No content found in article.</p>")
+    return fragments
+
+
+def notes_file_name(unit, fmt="docx"):
+    return f"{unit.replace(' ', '_')}.{fmt}"
+
+
+def zip_documents(documents, fmt="docx", output=None):
+    """
+    Bundle unit documents into one ZIP archive.
+    Args:
+        documents (dict): Unit -> document bytes or file object (copied from the start).
+        output (file): If given, the archive is written here and returned (rewound) instead of as bytes.
+    """
+    target = output if output is not None else BytesIO()
+    # DOCX files are already deflated; storing them keeps zipping instant
+    compression = zipfile.ZIP_STORED if fmt == "docx" else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(target, "w", compression) as archive:
+        for unit, document in documents.items():
+            if isinstance(document, bytes):
+                archive.writestr(notes_file_name(unit, fmt), document)
+                continue
+            document.seek(0)
+            with archive.open(notes_file_name(unit, fmt), "w") as entry:
+                shutil.copyfileobj(document, entry)
+    if output is None:
+        return target.getvalue()
+    output.seek(0)
+    return output
+
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def render_pool():
+    """Return the process-wide render pool, creating it on first use."""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            # Spawned workers do not inherit locks held by other threads of the app
+            _render_pool = ProcessPoolExecutor(
+                max_workers=RENDER_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _render_pool
+
+
+def render_sections(sections, fmt="docx", processes=RENDER_PROCESSES, converted=None, title="Notes",
+                    output=None, spill_dir=None):
+    """
+    Render parsed sections (block lists, see notes_blocks) in one format.
+    DOCX and PDF are rendered in the render pool unless `processes` is 1: their
+    images are downloaded here (I/O, through the shared cache) and the bytes
+    passed to the worker, which only optimizes them and builds the document.
+    Markdown and HTML only link images and are rendered in-thread.
+    `converted` (DOCX sections to reuse) only applies when rendering in-thread.
+
+    Low-memory rendering: with `spill_dir` images are written to files there as
+    they download (and deleted after the render), and with `output` the
+    document is written to that file instead of returned as bytes. Both
+    render in-thread.
+    Returns:
+        Future: Resolves to (document bytes or `output`, image report).
+    """
+    from notes_blocks import image_urls
+    from notes_formats import IMAGE_FORMATS, render_sections_bytes
+
+    images, image_dir = None, None
+    if fmt in IMAGE_FORMATS:
+        from images import fetch_images, is_supported_image, spill_images
+
+        urls = [url for blocks in sections for url in image_urls(blocks) if is_supported_image(url)]
+        with span("unit_image_download"):
+            if spill_dir:
+                image_dir = tempfile.TemporaryDirectory(dir=spill_dir)
+                downloaded = spill_images(urls, image_dir.name, max_workers=LOW_MEMORY_IMAGE_WORKERS)
+            else:
+                downloaded = fetch_images(urls)
+        images = {url: downloaded.get(url) for url in urls}
+    start = time.perf_counter()
+    if processes > 1 and fmt in IMAGE_FORMATS and output is None and image_dir is None:
+        # Spans inside the worker stay in its process; time the whole render from here
+        future = render_pool().submit(render_sections_bytes, sections, fmt, images, None, title)
+        future.add_done_callback(lambda _: metrics.observe("unit_render", time.perf_counter() - start))
+        return future
+    future = Future()
+    try:
+        with span("unit_render"):
+            future.set_result(render_sections_bytes(sections, fmt, images, converted, title, output))
+    except Exception as e:
+        future.set_exception(e)
+    finally:
+        if image_dir is not None:
+            image_dir.cleanup()
+    return future
+
+
+def render_fragments(fragments, processes=RENDER_PROCESSES, converted=None):
+    """
+    Render HTML fragments to a DOCX: parse them into blocks (through the block
+    cache) and render those with render_sections.
+    Returns:
+        Future: Resolves to (DOCX bytes, image report).
+    """
+    from notes_blocks import fragments_to_sections
+
+    return render_sections(fragments_to_sections(fragments), "docx", processes, converted)
+
+
+class NotesJob:
+    """
+    Generate one document per unit on a background thread.
+
+    The job only touches its own attributes (never Streamlit), so it can be
+    kept in st.session_state and polled across reruns. Units are rendered in
+    a process pool as soon as their topics are fetched, and each unit's
+    document is published in `documents` when it is built. With
+    `combined=True` a single document with every unit is also built
+    (`combined_document`). The parsed blocks of every unit are kept in
+    `sections`, so render() can produce the notes in another format without
+    fetching or parsing anything again.
+
+    With a `memory_budget_mb`, the job trades speed for memory: units render
+    in-thread (a render process holds its own copy of the libraries, images
+    and document), images are spilled to temporary files as they download,
+    each unit's blocks are written to disk before its document is built,
+    rendered articles kept for reuse across units are capped at a quarter of
+    the budget, and documents are saved to spooled temporary files that stay
+    in memory only while they fit another quarter. Read documents with
+    document().
+    """
+
+    def __init__(self, syllabus, combined=False, processes=RENDER_PROCESSES, fmt="docx",
+                 memory_budget_mb=MEMORY_BUDGET_MB):
+        self.syllabus = syllabus
+        self.combined = combined
+        self.memory_budget_mb = memory_budget_mb
+        # Render processes each hold a copy of the libraries, images and document; stay in-thread
+        self.processes = 1 if memory_budget_mb else processes
+        self.fmt = fmt
+        self.total_topics = sum(len(topics) for topics in syllabus.values())
+        self.done_topics = 0
+        self.log = []
+        self.documents = {}  # unit -> document bytes or spooled file (in `fmt`), in the order units finish
+        self.sections = {}  # unit -> parsed block lists of its document, or the file they were spilled to
+        self.image_reports = {}  # unit -> {"original_bytes", "optimized_bytes"}
+        self.fetch_stats = {}  # filled by the fetch plan once all units are fetched
+        self.combined_document = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        # Highest memory of the process sampled while the job ran (other jobs in it included)
+        self.peak_rss_mb = None
+        # Documents kept in memory share a quarter of the budget; larger ones go to disk
+        self._spool_bytes = memory_budget_mb * 1024 * 1024 // 4 // (len(syllabus) + combined or 1)
+        self._spill = tempfile.TemporaryDirectory(prefix="notes_job_") if memory_budget_mb else None
+        self._renders = {}  # (format, unit or None) -> bytes rendered on request
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    @property
+    def progress(self):
+        """Fraction of work done: fetching counts for 80%, building documents for the rest."""
+        fetched = self.done_topics / self.total_topics if self.total_topics else 1.0
+        built = len(self.documents) / len(self.syllabus) if self.syllabus else 1.0
+        return min(1.0, 0.8 * fetched + 0.2 * built)
+
+    def start(self):
+        self.started_at = time.time()
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        """Block until the job finishes (or `timeout` seconds pass). Returns whether it finished."""
+        self._thread.join(timeout)
+        return self.finished
+
+    def refresh(self):
+        """Nothing to reload: the attributes are live (see job_queue.QueuedNotes for queued jobs)."""
+        return self
+
+    def _on_topic(self, unit, topic, url):
+        with self._lock:
+            self.done_topics += 1
+            if url:
+                self.log.append(f"Found URL for **{topic}** ({unit}): {url}")
+            else:
+                self.log.append(f"No article found for topic: **{topic}** ({unit})")
+
+    def _publish(self, unit, future):
+        try:
+            document, image_report = future.result()
+        except Exception as e:
+            with self._lock:
+                self.log.append(f"Could not create notes for {unit}: {type(e).__name__}: {e}")
+            return
+        with self._lock:
+            self.image_reports[unit] = image_report
+            self.documents[unit] = document
+            self.log.append(f"Notes for {unit} created")
+
+    def document(self, unit=None):
+        """A finished unit's document (None for the combined one) as bytes, or None if not built."""
+        with self._lock:
+            document = self.documents.get(unit) if unit is not None else self.combined_document
+            if document is None or isinstance(document, bytes):
+                return document
+            # Spooled files share one position; read them under the lock
+            document.seek(0)
+            return document.read()
+
+    def zip_bytes(self, fmt=None):
+        """All finished unit documents as one ZIP archive, in syllabus order."""
+        fmt = fmt or self.fmt
+        output = self._spooled()
+        if fmt != self.fmt:
+            units = [unit for unit in self.syllabus if unit in self.sections]
+            archive = zip_documents({unit: self.render(fmt, unit) for unit in units}, fmt, output)
+        else:
+            with self._lock:
+                documents = {unit: self.documents[unit] for unit in self.syllabus if unit in self.documents}
+                archive = zip_documents(documents, fmt, output)
+        return archive if output is None else archive.read()
+
+    def render(self, fmt, unit=None):
+        """
+        Render finished notes in any format from their parsed blocks (no fetching or parsing).
+        Args:
+            fmt (str): A key of notes_formats.FORMATS.
+            unit (str): One unit, or None for every unit in one document.
+        Returns:
+            bytes: The document.
+        """
+        with self._lock:
+            if (fmt, unit) in self._renders:
+                return self._renders[fmt, unit]
+        units = [unit] if unit is not None else [name for name in self.syllabus if name in self.sections]
+        sections = [blocks for name in units for blocks in self.unit_sections(name)]
+        document = render_sections(sections, fmt, processes=1, title=unit or "Notes").result()[0]
+        if not self.memory_budget_mb:
+            with self._lock:
+                self._renders[fmt, unit] = document
+        return document
+
+    # ----- Low-memory mode -----
+
+    def _spooled(self):
+        """A file for one document in low-memory mode, else None (documents stay bytes)."""
+        if not self.memory_budget_mb:
+            return None
+        return tempfile.SpooledTemporaryFile(max_size=self._spool_bytes, dir=self._spill.name)
+
+    def _keep_sections(self, unit, sections):
+        if not self.memory_budget_mb:
+            with self._lock:
+                self.sections[unit] = sections
+            return
+        from notes_blocks import pack_blocks
+
+        codec, data = pack_blocks(sections)
+        path = os.path.join(self._spill.name, f"sections_{len(self.sections)}.{codec}")
+        with open(path, "wb") as file:
+            file.write(data)
+        with self._lock:
+            self.sections[unit] = path
+
+    def unit_sections(self, unit):
+        """A finished unit's parsed block lists, read back from disk in low-memory mode."""
+        with self._lock:
+            sections = self.sections[unit]
+        if not isinstance(sections, str):
+            return sections
+        from notes_blocks import unpack_blocks
+
+        with open(sections, "rb") as file:
+            return unpack_blocks(sections.rsplit(".", 1)[1], file.read())
+
+    def _sample_rss(self, stop):
+        """Track the process's highest memory until `stop` is set (always sampling once)."""
+        while True:
+            rss = rss_mb()
+            if rss is None:
+                # Cannot be sampled here; the process's lifetime peak is the closest measure
+                self.peak_rss_mb = peak_rss_mb()
+                return
+            self.peak_rss_mb = max(self.peak_rss_mb or 0, rss)
+            if stop.wait(RSS_SAMPLE_SECONDS):
+                return
+
+    def _index(self, unit, results):
+        """Add the unit's articles to the local knowledge base (best effort)."""
+        from notes_index import default_notes_index
+
+        try:
+            embedded = default_notes_index().add_unit(results)
+        except Exception as e:
+            self.log.append(f"Could not index {unit} for the knowledge base: {e}")
+            return
+        if embedded:
+            self.log.append(f"Indexed {embedded} new or changed topics from {unit}")
+
+    def _run(self):
+        from gfg import iter_syllabus_articles
+        from notes_blocks import fragments_to_sections
+
+        rendering = []
+        # DOCX of articles shared by units rendered in this process, bounded by the memory budget
+        converted = {}
+        if self.memory_budget_mb and self.fmt == "docx":
+            from html_to_docx import ConvertedCache
+
+            converted = ConvertedCache(self.memory_budget_mb * 1024 * 1024 // 4)
+        spill_dir = self._spill.name if self._spill else None
+        sampling = threading.Event()
+        threading.Thread(target=self._sample_rss, args=(sampling,), daemon=True).start()
+        try:
+            for unit, results in iter_syllabus_articles(self.syllabus, on_topic=self._on_topic,
+                                                        stats=self.fetch_stats):
+                sections = fragments_to_sections(build_unit_fragments(unit, results))
+                self._keep_sections(unit, sections)  # before publishing, so render() can use them
+                future = render_sections(sections, self.fmt, self.processes, converted, title=unit,
+                                         output=self._spooled(), spill_dir=spill_dir)
+                del sections  # only the spilled copy remains in low-memory mode
+                future.add_done_callback(lambda f, unit=unit: self._publish(unit, f))
+                rendering.append(future)
+                self._index(unit, results)
+            if self.fetch_stats.get("fetches_saved"):
+                stats = self.fetch_stats
+                self.log.append(
+                    f"{stats['topics']} topics needed {stats['searches']} searches and "
+                    f"{stats['articles']} article downloads ({stats['fetches_saved']} fetches saved)"
+                )
+            if self.combined:
+                units = [unit for unit in self.syllabus if unit in self.sections]
+                all_sections = [blocks for unit in units for blocks in self.unit_sections(unit)]
+                self.combined_document = render_sections(all_sections, self.fmt, self.processes, converted,
+                                                         output=self._spooled(),
+                                                         spill_dir=spill_dir).result()[0]
+                self.log.append("Combined notes for all units created")
+            for future in rendering:
+                future.exception()  # wait; failures are logged by _publish
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            sampling.set()
+            self._sample_rss(sampling)
+            if self.peak_rss_mb is not None:
+                budget = f" (notes budget {self.memory_budget_mb} MB)" if self.memory_budget_mb else ""
+                self.log.append(f"Peak memory of the process during this job: {self.peak_rss_mb:.0f} MB{budget}")
+            self.finished_at = time.time()
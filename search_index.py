@@ -0,0 +1,180 @@
+"""
+Local index of GfG search candidates per topic, with manual overrides.
+
+The search layer asks GfG for the top few articles of a topic in one request,
+stores them here and ranks them locally against the topic and its unit, so
+later runs (and picking a different article by hand) need no new search.
+
+Usage (from the repository root):
+    python search_index.py show "BST"                 # ranked candidates
+    python search_index.py use "BST" https://www...   # always use this article
+    python search_index.py clear "BST"                # back to the best ranked one
+"""
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from notes_cache import CACHE_DIR, DEFAULT_TTL
+
+# Words that say nothing about which article is the right one
+STOPWORDS = {"a", "an", "and", "the", "of", "in", "on", "for", "to", "with", "using", "set", "introduction"}
+# Unit names are mostly labels ("Unit – 1"); only their real words count as context
+CONTEXT_STOPWORDS = {"unit", "chapter", "module", "part"}
+# Weights of the ranking signals (sum to 1)
+TOPIC_WEIGHT = 0.5  # share of the topic's words found in the title or URL
+PRECISION_WEIGHT = 0.2  # share of the title that is about the topic
+CONTEXT_WEIGHT = 0.25  # overlap with the unit name and its other topics
+RANK_WEIGHT = 0.05  # GfG's own order, as a tie breaker
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    query TEXT PRIMARY KEY,
+    candidates TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS overrides (
+    query TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    set_at REAL NOT NULL
+);
+"""
+
+
+def tokens(text):
+    return set(re.findall(r"[a-z0-9+#]+", (text or "").lower())) - STOPWORDS
+
+
+def _slug_tokens(url):
+    # ".../avl-tree-set-1-insertion/" -> {"avl", "tree", "1", "insertion"}
+    path = re.sub(r"^\w+://[^/]+", "", url or "")
+    return tokens(path.replace("-", " ").replace("/", " "))
+
+
+def score_candidate(query, candidate, context="", rank=0):
+    """
+    Score how well a search hit matches a topic (0 to 1).
+    Args:
+        query (str): The (normalized) topic searched for.
+        candidate (dict): {"url", "title"}.
+        context (str): Unit name and sibling topics, to break ties between meanings.
+        rank (int): Position in GfG's answer.
+    """
+    words = tokens(query)
+    # Recall looks at the title and URL; precision at the title alone (slugs carry extra words)
+    title = tokens(candidate.get("title")) or _slug_tokens(candidate.get("url"))
+    described = title | _slug_tokens(candidate.get("url"))
+    if not words or not described:
+        return RANK_WEIGHT / (1 + rank)
+    context_words = {word for word in tokens(context) - words - CONTEXT_STOPWORDS if not word.isdigit()}
+    context_score = len(context_words & described) / len(context_words) if context_words else 0.0
+    return (TOPIC_WEIGHT * len(words & described) / len(words)
+            + PRECISION_WEIGHT * len(words & title) / len(title)
+            + CONTEXT_WEIGHT * context_score
+            + RANK_WEIGHT / (1 + rank))
+
+
+def rank_candidates(query, candidates, context=""):
+    """Return the candidates best first, each with a "score"."""
+    scored = [
+        {**candidate, "score": round(score_candidate(query, candidate, context, rank), 4)}
+        for rank, candidate in enumerate(candidates)
+    ]
+    return sorted(scored, key=lambda candidate: candidate["score"], reverse=True)
+
+
+class SearchIndex:
+    """SQLite store of search candidates per query, plus user-chosen overrides."""
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "search_index.sqlite3")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def candidates(self, query):
+        """Stored candidates in GfG's order, or None if unknown or older than the TTL."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT candidates FROM candidates WHERE query = ? AND fetched_at > ?",
+                (query, time.time() - self.ttl),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, query, candidates):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO candidates VALUES (?, ?, ?)",
+                (query, json.dumps(candidates), time.time()),
+            )
+            self._db.commit()
+
+    def override(self, query):
+        with self._lock:
+            row = self._db.execute("SELECT url FROM overrides WHERE query = ?", (query,)).fetchone()
+        return row[0] if row else None
+
+    def set_override(self, query, url):
+        """Always use `url` for this query; None removes the override."""
+        with self._lock:
+            if url:
+                self._db.execute("INSERT OR REPLACE INTO overrides VALUES (?, ?, ?)", (query, url, time.time()))
+            else:
+                self._db.execute("DELETE FROM overrides WHERE query = ?", (query,))
+            self._db.commit()
+
+    def best(self, query, context=""):
+        """The override if any, else the best ranked stored candidate's URL (None if unknown)."""
+        url = self.override(query)
+        if url:
+            return url
+        candidates = self.candidates(query)
+        return rank_candidates(query, candidates, context)[0]["url"] if candidates else None
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_search_index():
+    """Return the process-wide SearchIndex, creating it on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = SearchIndex()
+        return _default
+
+
+def main():
+    from gfg import normalize_topic, search_gfg_candidates
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ("show", "use", "clear"):
+        raise SystemExit(__doc__)
+    command, topic = sys.argv[1], sys.argv[2]
+    query = normalize_topic(topic)
+    index = default_search_index()
+    if command == "use":
+        index.set_override(query, sys.argv[3])
+    elif command == "clear":
+        index.set_override(query, None)
+    candidates = index.candidates(query)
+    if candidates is None:
+        candidates = search_gfg_candidates(topic)
+        index.put(query, candidates)
+    override = index.override(query)
+    for candidate in rank_candidates(query, candidates):
+        marker = "*" if candidate["url"] == override else " "
+        print(f"{marker} {candidate['score']:.3f}  {candidate['title']}  {candidate['url']}")
+    if override:
+        print(f"Override: {override}")
+
+
+if __name__ == "__main__":
+    main()
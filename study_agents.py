@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+from llm_cache import agent_scope
+from metrics import incr, metrics
+
+MODEL_ID = "llama-3.3-70b-versatile"
+
+# Limits of each API key in this process: Groq limits requests per key, so keys do not share them
+GROQ_REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", 30))
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", 4))
+
+AGENT_DESCRIPTIONS = {
+    "youtube": "You are a YouTube agent. Obtain the captions of a YouTube video and answer questions.",
+    "arxiv": "You are an Arxiv agent. Fetch and summarize research papers.",
+    "web": "You are a web agent. Search and summarize web content.",
+    "flashcards": "You are a flashcard generator. Create flashcards for the given topic.",
+    "summarizer": "You are a summarizer. Summarize the provided text faithfully and concisely.",
+}
+
+
+# Tool modules are imported only when the agent that needs them is first built
+def _youtube_tools():
+    from agno.tools.youtube import YouTubeTools
+    return [YouTubeTools()]
+
+
+def _arxiv_tools():
+    from agno.tools.arxiv import ArxivTools
+    return [ArxivTools()]
+
+
+def _web_tools():
+    # from agno.tools.tavily import TavilyTools
+    from agno.tools.newspaper4k import Newspaper4kTools
+    return [Newspaper4kTools()]
+
+
+AGENT_TOOLS = {
+    "youtube": _youtube_tools,
+    "arxiv": _arxiv_tools,
+    "web": _web_tools,
+    "flashcards": list,
+    "summarizer": list,
+}
+
+
+@lru_cache(maxsize=32)
+def _agent_parts(name, api_key, model_id):
+    """Groq model (with its HTTP client) and tools of one agent and key, built once and shared by its runs."""
+    from agno.models.groq import Groq
+
+    return Groq(id=model_id, api_key=api_key), tuple(AGENT_TOOLS[name]())
+
+
+def build_agent(name, api_key, model_id=MODEL_ID):
+    """
+    Build one of the Study Agents with its Groq model and tools.
+    Args:
+        name (str): One of AGENT_DESCRIPTIONS.
+        api_key (str): Groq API key.
+        model_id (str): Groq model to use.
+    Returns:
+        Agent: A ready-to-run agent for one request. Agents keep the state of their
+        runs (last response, memory), so concurrent requests must not share one;
+        the model, its client and the tools are built once per key and reused,
+        so only the cheap Agent wrapper is new.
+    """
+    from agno.agent import Agent
+
+    model, tools = _agent_parts(name, api_key, model_id)
+    return Agent(
+        name=name,
+        model=model,
+        tools=list(tools),
+        show_tool_calls=True,
+        description=AGENT_DESCRIPTIONS[name],
+    )
+
+
+_limits = {}  # API key -> (concurrency semaphore, requests-per-minute bucket)
+_limits_lock = threading.Lock()
+
+
+@contextmanager
+def model_slot(agent):
+    """
+    Hold one of the GROQ_MAX_CONCURRENCY slots of the agent's API key for a
+    model call, after waiting for that key's requests-per-minute budget.
+    """
+    key = getattr(agent.model, "api_key", None)
+    with _limits_lock:
+        if key not in _limits:
+            from http_client import TokenBucket
+            rate = GROQ_REQUESTS_PER_MINUTE / 60
+            _limits[key] = (threading.BoundedSemaphore(GROQ_MAX_CONCURRENCY), TokenBucket(rate, GROQ_MAX_CONCURRENCY))
+        slots, bucket = _limits[key]
+    with slots:
+        bucket.acquire()
+        yield
+
+
+def _total(value):
+    # Run metrics hold one value per model call
+    return sum(v for v in value if v) if isinstance(value, list) else (value or 0)
+
+
+def record_run_metrics(agent, response, seconds):
+    """
+    Record one agent run: wall time, tokens, and how much of it went to tool
+    calls versus the model.
+    """
+    name = agent.name or "agent"
+    metrics.observe("agent_run", seconds, agent=name)
+    run_metrics = getattr(response, "metrics", None) or {}
+    incr("agent_input_tokens", _total(run_metrics.get("input_tokens")), agent=name)
+    incr("agent_output_tokens", _total(run_metrics.get("output_tokens")), agent=name)
+    if run_metrics.get("time"):
+        metrics.observe("agent_model", _total(run_metrics["time"]), agent=name)
+    tools = getattr(response, "tools", None) or []
+    if tools:
+        tool_seconds = sum(tool.metrics.time or 0 for tool in tools if tool.metrics)
+        metrics.observe("agent_tools", tool_seconds, agent=name)
+        incr("agent_tool_calls", len(tools), agent=name)
+
+
+def stream_agent(agent, message, timings=None, cache=None):
+    """
+    Run an agent with streaming and yield the response text as it arrives.
+    Args:
+        agent (Agent): Agent to run.
+        message (str): Prompt.
+        timings (dict): If given, filled with "ttft" (time to first token),
+            "total" in seconds and "cached" once the stream is consumed.
+        cache (LLMResponseCache): If given, a cached answer is returned without
+            calling the model, and fresh answers are stored.
+    Yields:
+        str: Content deltas, ready for st.write_stream.
+    """
+    from agno.run.response import RunEvent
+
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
+    if cache is not None:
+        scope = agent_scope(agent)
+        cached = cache.get(scope, message)
+        if cached is not None:
+            timings["ttft"] = timings["total"] = time.perf_counter() - start
+            timings["cached"] = True
+            incr("agent_cached_answers", agent=agent.name or "agent")
+            yield cached
+            return
+
+    parts = []
+    with model_slot(agent):
+        for event in agent.run(message, stream=True, markdown=True):
+            content = getattr(event, "content", None)
+            if getattr(event, "event", None) != RunEvent.run_response_content.value or not isinstance(content, str):
+                continue
+            if content:
+                timings.setdefault("ttft", time.perf_counter() - start)
+                parts.append(content)
+                yield content
+    timings["total"] = time.perf_counter() - start
+    timings["cached"] = False
+    record_run_metrics(agent, agent.run_response, timings["total"])
+    if cache is not None and parts:
+        cache.put(scope, message, "".join(parts))
@@ -0,0 +1,63 @@
+import re
+
+from bs4.element import PreformattedString
+
+# Page chrome that GfG mixes into article text (matched as whole words, case-insensitive)
+REMOVE_PHRASES = [
+    "Summarize", "Comments", "Improve", "Like Article", "Save", "Share",
+    "Report", "Follow", "Suggest changes",
+]
+# Extra regular expressions to remove
+REMOVE_PATTERNS = [
+    r"Last Updated\s*:\s*\d{1,2} \w+, \d{4}",
+]
+# Text inside these tags is left untouched (whitespace is significant in code)
+PRESERVE_TAGS = {"pre", "code", "script", "style"}
+
+
+class TextCleaner:
+    """
+    Remove boilerplate phrases and collapse whitespace in one regex pass.
+
+    All phrases and patterns are compiled into a single alternation together
+    with the whitespace rule, so each text is scanned once. A removed phrase
+    also takes the whitespace after it, and any remaining run of whitespace
+    becomes a single space.
+    """
+
+    def __init__(self, phrases=REMOVE_PHRASES, patterns=REMOVE_PATTERNS):
+        alternatives = []
+        if phrases:
+            # One shared \b...\b around the phrase alternation keeps the scan cheap
+            alternatives.append(r"\b(?i:{})\b\s*".format("|".join(re.escape(p) for p in phrases)))
+        alternatives += [rf"(?i:{pattern})\s*" for pattern in patterns]
+        alternatives.append(r"\s{2,}")
+        self._regex = re.compile("|".join(alternatives))
+
+    @staticmethod
+    def _replace(match):
+        # Whitespace runs collapse to one space; removed phrases vanish
+        return " " if match.group()[0].isspace() else ""
+
+    def clean(self, text):
+        """Clean one piece of plain text."""
+        return self._regex.sub(self._replace, text)
+
+    def clean_tree(self, root):
+        """
+        Clean every text node under a parsed element in place.
+        Markup, attributes and text inside PRESERVE_TAGS are not touched.
+        """
+        for node in list(root.find_all(string=True)):
+            # Comments, CDATA and doctypes are not visible text
+            if isinstance(node, PreformattedString):
+                continue
+            if any(parent.name in PRESERVE_TAGS for parent in node.parents):
+                continue
+            cleaned = self.clean(node)
+            if cleaned != node:
+                node.replace_with(cleaned)
+        return root
+
+
+default_cleaner = TextCleaner()